@@ -12,14 +12,44 @@ Returns dictionaries in the shape expected by `GeminiSummarizer`:
 
 from __future__ import annotations
 
-import json
+import functools
 import os
 import re
-from collections import defaultdict
+import sys
+import time
 from html import unescape
-from typing import Any, Dict, Iterable, List, Mapping, MutableSequence, Sequence
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    MutableSequence,
+    NamedTuple,
+    Sequence,
+    Tuple,
+)
+
+# requests (and the thread pool) are imported where they are used so that a
+# warm-cache run never loads the HTTP stack.
+if TYPE_CHECKING:
+    import requests
+
+try:  # orjson is an optional, faster drop-in for (de)serializing the JSON payloads.
+    from orjson import dumps as _dumps, loads as _loads
+except ImportError:
+    from json import loads as _loads
+
+    def _dumps(obj: Any) -> bytes:
+        import json
 
-import requests
+        return json.dumps(obj).encode("utf-8")
+
+try:  # selectolax (lexbor backend) is an optional C parser for the HTML heuristic.
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
 
 
 DEFAULT_BASE_SITE = "https://seanprashad.com/leetcode-patterns/"
@@ -30,506 +60,127 @@ FALLBACK_PATTERNS_FILE_ENV = "FALLBACK_PATTERNS_FILE"
 # Comma-separated list of additional JSON URLs to merge in (env var).
 ADDITIONAL_SOURCES_ENV = "ADDITIONAL_PATTERNS_URLS"
 DEFAULT_ADDITIONAL_SOURCES = ["https://neetcode.io/practice/practice/neetcode150"]
-# Minimal built-in fallback so we never return empty during offline runs.
-LOCAL_MINIMAL_FALLBACK = [
-    {
-        "pattern": "Two Pointers",
-        "url": "",
-        "notes": "Move two indices from ends or same side to shrink search space.",
-        "problems": [
-            {
-                "title": "Two Sum II - Input Array Is Sorted",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/two-sum-ii-input-array-is-sorted/",
-            },
-            {
-                "title": "3Sum",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/3sum/",
-            },
-            {
-                "title": "Container With Most Water",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/container-with-most-water/",
-            },
-        ],
-    },
-    {
-        "pattern": "Binary Search",
-        "url": "",
-        "notes": "Halve the search space; prove monotonicity before applying.",
-        "problems": [
-            {
-                "title": "Binary Search",
-                "difficulty": "Easy",
-                "url": "https://leetcode.com/problems/binary-search/",
-            },
-            {
-                "title": "Search Insert Position",
-                "difficulty": "Easy",
-                "url": "https://leetcode.com/problems/search-insert-position/",
-            },
-            {
-                "title": "Find Peak Element",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/find-peak-element/",
-            },
-        ],
-    },
-    {
-        "pattern": "Sliding Window",
-        "url": "",
-        "notes": "Maintain a window over the array/string to track counts or sums efficiently.",
-        "problems": [
-            {
-                "title": "Longest Substring Without Repeating Characters",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/longest-substring-without-repeating-characters/",
-            },
-            {
-                "title": "Minimum Size Subarray Sum",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/minimum-size-subarray-sum/",
-            },
-            {
-                "title": "Permutation in String",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/permutation-in-string/",
-            },
-        ],
-    },
-    {
-        "pattern": "Dynamic Programming",
-        "url": "",
-        "notes": "Overlapping subproblems + optimal substructure; define state, transition, base cases.",
-        "problems": [
-            {
-                "title": "Climbing Stairs",
-                "difficulty": "Easy",
-                "url": "https://leetcode.com/problems/climbing-stairs/",
-            },
-            {
-                "title": "Coin Change",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/coin-change/",
-            },
-            {
-                "title": "Longest Increasing Subsequence",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/longest-increasing-subsequence/",
-            },
-        ],
-    },
-    {
-        "pattern": "Backtracking",
-        "url": "",
-        "notes": "DFS over decision tree; choose, explore, unchoose.",
-        "problems": [
-            {
-                "title": "Subsets",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/subsets/",
-            },
-            {
-                "title": "Permutations",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/permutations/",
-            },
-            {
-                "title": "Combination Sum",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/combination-sum/",
-            },
-        ],
-    },
-    {
-        "pattern": "Breadth-First Search",
-        "url": "",
-        "notes": "Level-order traversal for shortest paths or minimum steps.",
-        "problems": [
-            {
-                "title": "Binary Tree Level Order Traversal",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/binary-tree-level-order-traversal/",
-            },
-            {
-                "title": "Word Ladder",
-                "difficulty": "Hard",
-                "url": "https://leetcode.com/problems/word-ladder/",
-            },
-            {
-                "title": "Rotting Oranges",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/rotting-oranges/",
-            },
-        ],
-    },
-    {
-        "pattern": "Depth-First Search",
-        "url": "",
-        "notes": "Recursive/stack traversal for connectivity, components, and enumerations.",
-        "problems": [
-            {
-                "title": "Number of Islands",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/number-of-islands/",
-            },
-            {
-                "title": "Clone Graph",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/clone-graph/",
-            },
-            {
-                "title": "Course Schedule",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/course-schedule/",
-            },
-        ],
-    },
-    {
-        "pattern": "Greedy",
-        "url": "",
-        "notes": "Pick locally optimal choices that lead to global optimum; prove with exchange arguments.",
-        "problems": [
-            {
-                "title": "Jump Game",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/jump-game/",
-            },
-            {
-                "title": "Merge Intervals",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/merge-intervals/",
-            },
-            {
-                "title": "Gas Station",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/gas-station/",
-            },
-        ],
-    },
-    {
-        "pattern": "Disjoint Set / Union-Find",
-        "url": "",
-        "notes": "Maintain dynamic connectivity with union/find and path compression + union by rank.",
-        "problems": [
-            {
-                "title": "Redundant Connection",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/redundant-connection/",
-            },
-            {
-                "title": "Number of Provinces",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/number-of-provinces/",
-            },
-            {
-                "title": "Accounts Merge",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/accounts-merge/",
-            },
-        ],
-    },
-    {
-        "pattern": "Topological Sort",
-        "url": "",
-        "notes": "Order DAG nodes with in-degree (Kahn) or DFS post-order to detect cycles.",
-        "problems": [
-            {
-                "title": "Course Schedule",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/course-schedule/",
-            },
-            {
-                "title": "Course Schedule II",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/course-schedule-ii/",
-            },
-            {
-                "title": "Alien Dictionary",
-                "difficulty": "Hard",
-                "url": "https://leetcode.com/problems/alien-dictionary/",
-            },
-        ],
-    },
-    {
-        "pattern": "Priority Queue / Heap",
-        "url": "",
-        "notes": "Maintain best/worst element efficiently; great for k-th problems and greedy checks.",
-        "problems": [
-            {
-                "title": "Kth Largest Element in an Array",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/kth-largest-element-in-an-array/",
-            },
-            {
-                "title": "Task Scheduler",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/task-scheduler/",
-            },
-            {
-                "title": "Merge k Sorted Lists",
-                "difficulty": "Hard",
-                "url": "https://leetcode.com/problems/merge-k-sorted-lists/",
-            },
-        ],
-    },
-    {
-        "pattern": "Prefix Sum / Difference Array",
-        "url": "",
-        "notes": "Precompute cumulative sums to query ranges in O(1); use diffs for range updates.",
-        "problems": [
-            {
-                "title": "Range Sum Query - Immutable",
-                "difficulty": "Easy",
-                "url": "https://leetcode.com/problems/range-sum-query-immutable/",
-            },
-            {
-                "title": "Subarray Sum Equals K",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/subarray-sum-equals-k/",
-            },
-            {
-                "title": "Corporate Flight Bookings",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/corporate-flight-bookings/",
-            },
-        ],
-    },
-    {
-        "pattern": "Monotonic Stack / Queue",
-        "url": "",
-        "notes": "Maintain increasing/decreasing stack to find next/prev greater/smaller efficiently.",
-        "problems": [
-            {
-                "title": "Daily Temperatures",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/daily-temperatures/",
-            },
-            {
-                "title": "Largest Rectangle in Histogram",
-                "difficulty": "Hard",
-                "url": "https://leetcode.com/problems/largest-rectangle-in-histogram/",
-            },
-            {
-                "title": "Sliding Window Maximum",
-                "difficulty": "Hard",
-                "url": "https://leetcode.com/problems/sliding-window-maximum/",
-            },
-        ],
-    },
-    {
-        "pattern": "Trie",
-        "url": "",
-        "notes": "Prefix tree for fast prefix queries, word search, and replacement.",
-        "problems": [
-            {
-                "title": "Implement Trie (Prefix Tree)",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/implement-trie-prefix-tree/",
-            },
-            {
-                "title": "Replace Words",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/replace-words/",
-            },
-            {
-                "title": "Word Search II",
-                "difficulty": "Hard",
-                "url": "https://leetcode.com/problems/word-search-ii/",
-            },
-        ],
-    },
-    {
-        "pattern": "Interval Scheduling",
-        "url": "",
-        "notes": "Sort intervals; merge or choose greedily based on start/end times.",
-        "problems": [
-            {
-                "title": "Non-overlapping Intervals",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/non-overlapping-intervals/",
-            },
-            {
-                "title": "Meeting Rooms II",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/meeting-rooms-ii/",
-            },
-            {
-                "title": "Insert Interval",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/insert-interval/",
-            },
-        ],
-    },
-    {
-        "pattern": "Segment Tree / Fenwick",
-        "url": "",
-        "notes": "Range queries/updates in O(log n); choose Fenwick for simplicity, segment tree for flexibility.",
-        "problems": [
-            {
-                "title": "Range Sum Query - Mutable",
-                "difficulty": "Medium",
-                "url": "https://leetcode.com/problems/range-sum-query-mutable/",
-            },
-            {
-                "title": "Count of Smaller Numbers After Self",
-                "difficulty": "Hard",
-                "url": "https://leetcode.com/problems/count-of-smaller-numbers-after-self/",
-            },
-            {
-                "title": "Longest Substring with At Most K Distinct Characters",
-                "difficulty": "Hard",
-                "url": "https://leetcode.com/problems/longest-substring-with-at-most-k-distinct-characters/",
-            },
-        ],
-    },
-]
+# On-disk cache of scraped patterns; override the directory via LCP_CACHE_DIR.
+CACHE_DIR_ENV = "LCP_CACHE_DIR"
+CACHE_TTL_SECONDS = 6 * 60 * 60
+# Shorter lifetime for results missing an additional source that failed to fetch.
+PARTIAL_CACHE_TTL_SECONDS = 10 * 60
+# Upper bound on concurrent source fetches; they are purely network-bound.
+MAX_FETCH_WORKERS = 8
+USER_AGENT = "leetcode-patterns-aggregator/0.1 (+https://github.com/)"
+
+# Pre-compiled patterns for the per-scrape HTML extraction.
+_NEXT_DATA_RE = re.compile(r'<script[^>]+id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.DOTALL)
+_BLOCK_RE = re.compile(
+    r"<h[23]\b[^>]*>(?P<header>.*?)</h[23]>|<li\b[^>]*>(?P<item>.*?)</li>",
+    re.IGNORECASE | re.DOTALL,
+)
+_TAG_RE = re.compile(r"<[^>\x00]+>")
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+# Keys that mark a dict as a pattern entry inside Next.js page data.
+_PATTERN_KEYS = frozenset(("pattern", "name", "title"))
+_PROBLEM_KEYS = frozenset(("problems", "questions"))
+# Where question lists usually sit in Next.js page data, tried before a full walk.
+_QUESTION_PATHS = (
+    ("props", "pageProps", "questions"),
+    ("props", "pageProps", "problems"),
+)
+
+
+def build_session() -> requests.Session:
+    """Build a keep-alive Session tuned for the scraper's fetch pattern.
+
+    The adapter pool holds enough connections per host for the concurrent
+    additional-source fetches, and idempotent GETs are retried with backoff
+    on connection errors and 429/5xx (honouring Retry-After).
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=MAX_FETCH_WORKERS,
+        pool_maxsize=MAX_FETCH_WORKERS * 2,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "HEAD"}),
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT})
+    return session
+
+
+# Shared default session so repeated scrapes reuse pooled connections.
+_default_session = functools.cache(build_session)
+
+
+class Problem(NamedTuple):
+    """Immutable problem record used by the built-in fallback data."""
+
+    title: str
+    difficulty: str
+    url: str
+
+
+class Pattern(NamedTuple):
+    """Immutable pattern record used by the built-in fallback data."""
+
+    pattern: str
+    url: str
+    notes: str
+    problems: Tuple[Problem, ...]
+
+
+# Built-in fallback patterns (so we never return empty during offline runs) and
+# the problem library used to enrich short lists. Loaded from JSON on first use
+# and exposed as LOCAL_MINIMAL_FALLBACK / PROBLEM_LIBRARY via __getattr__.
+FALLBACK_DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "_fallback.json")
+
+
+@functools.cache
+def _fallback_data() -> Tuple[Tuple[Pattern, ...], Dict[str, Tuple[Problem, ...]]]:
+    """Load the built-in fallback patterns and problem library."""
+    with open(FALLBACK_DATA_FILE, "rb") as f:
+        data = _loads(f.read())
+
+    def to_problems(entries: Iterable[Mapping[str, str]]) -> Tuple[Problem, ...]:
+        return tuple(Problem(p["title"], sys.intern(p["difficulty"]), p["url"]) for p in entries)
+
+    patterns = tuple(
+        Pattern(
+            pattern=sys.intern(entry["pattern"]),
+            url=entry["url"],
+            notes=entry["notes"],
+            problems=to_problems(entry["problems"]),
+        )
+        for entry in data["patterns"]
+    )
+    # Intern library keys so lookups with interned scraped names hit on identity.
+    library = {sys.intern(name): to_problems(entries) for name, entries in data["library"].items()}
+    return patterns, library
 
-# Optional library to enrich patterns with more problems if scraped/fallback lists are short.
-PROBLEM_LIBRARY: Dict[str, List[Dict[str, str]]] = {
-    "Two Pointers": [
-        {"title": "Two Sum II - Input Array Is Sorted", "difficulty": "Medium", "url": "https://leetcode.com/problems/two-sum-ii-input-array-is-sorted/"},
-        {"title": "3Sum", "difficulty": "Medium", "url": "https://leetcode.com/problems/3sum/"},
-        {"title": "Container With Most Water", "difficulty": "Medium", "url": "https://leetcode.com/problems/container-with-most-water/"},
-        {"title": "Trapping Rain Water", "difficulty": "Hard", "url": "https://leetcode.com/problems/trapping-rain-water/"},
-        {"title": "Remove Nth Node From End of List", "difficulty": "Medium", "url": "https://leetcode.com/problems/remove-nth-node-from-end-of-list/"},
-        {"title": "Partition List", "difficulty": "Medium", "url": "https://leetcode.com/problems/partition-list/"},
-        {"title": "Squares of a Sorted Array", "difficulty": "Easy", "url": "https://leetcode.com/problems/squares-of-a-sorted-array/"},
-        {"title": "Move Zeroes", "difficulty": "Easy", "url": "https://leetcode.com/problems/move-zeroes/"},
-    ],
-    "Binary Search": [
-        {"title": "Binary Search", "difficulty": "Easy", "url": "https://leetcode.com/problems/binary-search/"},
-        {"title": "Search Insert Position", "difficulty": "Easy", "url": "https://leetcode.com/problems/search-insert-position/"},
-        {"title": "Find First and Last Position of Element in Sorted Array", "difficulty": "Medium", "url": "https://leetcode.com/problems/find-first-and-last-position-of-element-in-sorted-array/"},
-        {"title": "Search in Rotated Sorted Array", "difficulty": "Medium", "url": "https://leetcode.com/problems/search-in-rotated-sorted-array/"},
-        {"title": "Find Minimum in Rotated Sorted Array", "difficulty": "Medium", "url": "https://leetcode.com/problems/find-minimum-in-rotated-sorted-array/"},
-        {"title": "Capacity To Ship Packages Within D Days", "difficulty": "Medium", "url": "https://leetcode.com/problems/capacity-to-ship-packages-within-d-days/"},
-        {"title": "Koko Eating Bananas", "difficulty": "Medium", "url": "https://leetcode.com/problems/koko-eating-bananas/"},
-        {"title": "Median of Two Sorted Arrays", "difficulty": "Hard", "url": "https://leetcode.com/problems/median-of-two-sorted-arrays/"},
-    ],
-    "Sliding Window": [
-        {"title": "Longest Substring Without Repeating Characters", "difficulty": "Medium", "url": "https://leetcode.com/problems/longest-substring-without-repeating-characters/"},
-        {"title": "Minimum Window Substring", "difficulty": "Hard", "url": "https://leetcode.com/problems/minimum-window-substring/"},
-        {"title": "Permutation in String", "difficulty": "Medium", "url": "https://leetcode.com/problems/permutation-in-string/"},
-        {"title": "Longest Repeating Character Replacement", "difficulty": "Medium", "url": "https://leetcode.com/problems/longest-repeating-character-replacement/"},
-        {"title": "Sliding Window Maximum", "difficulty": "Hard", "url": "https://leetcode.com/problems/sliding-window-maximum/"},
-        {"title": "Fruit Into Baskets", "difficulty": "Medium", "url": "https://leetcode.com/problems/fruit-into-baskets/"},
-        {"title": "Subarrays with K Different Integers", "difficulty": "Hard", "url": "https://leetcode.com/problems/subarrays-with-k-different-integers/"},
-        {"title": "Minimum Size Subarray Sum", "difficulty": "Medium", "url": "https://leetcode.com/problems/minimum-size-subarray-sum/"},
-    ],
-    "Dynamic Programming": [
-        {"title": "Climbing Stairs", "difficulty": "Easy", "url": "https://leetcode.com/problems/climbing-stairs/"},
-        {"title": "House Robber", "difficulty": "Medium", "url": "https://leetcode.com/problems/house-robber/"},
-        {"title": "Coin Change", "difficulty": "Medium", "url": "https://leetcode.com/problems/coin-change/"},
-        {"title": "Longest Increasing Subsequence", "difficulty": "Medium", "url": "https://leetcode.com/problems/longest-increasing-subsequence/"},
-        {"title": "Longest Common Subsequence", "difficulty": "Medium", "url": "https://leetcode.com/problems/longest-common-subsequence/"},
-        {"title": "Edit Distance", "difficulty": "Hard", "url": "https://leetcode.com/problems/edit-distance/"},
-        {"title": "Word Break", "difficulty": "Medium", "url": "https://leetcode.com/problems/word-break/"},
-        {"title": "Partition Equal Subset Sum", "difficulty": "Medium", "url": "https://leetcode.com/problems/partition-equal-subset-sum/"},
-    ],
-    "Backtracking": [
-        {"title": "Subsets", "difficulty": "Medium", "url": "https://leetcode.com/problems/subsets/"},
-        {"title": "Permutations", "difficulty": "Medium", "url": "https://leetcode.com/problems/permutations/"},
-        {"title": "Combination Sum", "difficulty": "Medium", "url": "https://leetcode.com/problems/combination-sum/"},
-        {"title": "Letter Combinations of a Phone Number", "difficulty": "Medium", "url": "https://leetcode.com/problems/letter-combinations-of-a-phone-number/"},
-        {"title": "Palindrome Partitioning", "difficulty": "Medium", "url": "https://leetcode.com/problems/palindrome-partitioning/"},
-        {"title": "N-Queens", "difficulty": "Hard", "url": "https://leetcode.com/problems/n-queens/"},
-        {"title": "Word Search", "difficulty": "Medium", "url": "https://leetcode.com/problems/word-search/"},
-        {"title": "Generate Parentheses", "difficulty": "Medium", "url": "https://leetcode.com/problems/generate-parentheses/"},
-    ],
-    "Breadth-First Search": [
-        {"title": "Binary Tree Level Order Traversal", "difficulty": "Medium", "url": "https://leetcode.com/problems/binary-tree-level-order-traversal/"},
-        {"title": "Rotting Oranges", "difficulty": "Medium", "url": "https://leetcode.com/problems/rotting-oranges/"},
-        {"title": "Word Ladder", "difficulty": "Hard", "url": "https://leetcode.com/problems/word-ladder/"},
-        {"title": "Number of Islands", "difficulty": "Medium", "url": "https://leetcode.com/problems/number-of-islands/"},
-        {"title": "Shortest Path in Binary Matrix", "difficulty": "Medium", "url": "https://leetcode.com/problems/shortest-path-in-binary-matrix/"},
-        {"title": "Open the Lock", "difficulty": "Medium", "url": "https://leetcode.com/problems/open-the-lock/"},
-    ],
-    "Depth-First Search": [
-        {"title": "Number of Islands", "difficulty": "Medium", "url": "https://leetcode.com/problems/number-of-islands/"},
-        {"title": "Clone Graph", "difficulty": "Medium", "url": "https://leetcode.com/problems/clone-graph/"},
-        {"title": "Course Schedule", "difficulty": "Medium", "url": "https://leetcode.com/problems/course-schedule/"},
-        {"title": "Pacific Atlantic Water Flow", "difficulty": "Medium", "url": "https://leetcode.com/problems/pacific-atlantic-water-flow/"},
-        {"title": "Graph Valid Tree", "difficulty": "Medium", "url": "https://leetcode.com/problems/graph-valid-tree/"},
-        {"title": "Path Sum III", "difficulty": "Medium", "url": "https://leetcode.com/problems/path-sum-iii/"},
-    ],
-    "Greedy": [
-        {"title": "Jump Game", "difficulty": "Medium", "url": "https://leetcode.com/problems/jump-game/"},
-        {"title": "Jump Game II", "difficulty": "Medium", "url": "https://leetcode.com/problems/jump-game-ii/"},
-        {"title": "Merge Intervals", "difficulty": "Medium", "url": "https://leetcode.com/problems/merge-intervals/"},
-        {"title": "Non-overlapping Intervals", "difficulty": "Medium", "url": "https://leetcode.com/problems/non-overlapping-intervals/"},
-        {"title": "Gas Station", "difficulty": "Medium", "url": "https://leetcode.com/problems/gas-station/"},
-        {"title": "Partition Labels", "difficulty": "Medium", "url": "https://leetcode.com/problems/partition-labels/"},
-        {"title": "Minimum Number of Arrows to Burst Balloons", "difficulty": "Medium", "url": "https://leetcode.com/problems/minimum-number-of-arrows-to-burst-balloons/"},
-        {"title": "Candy", "difficulty": "Hard", "url": "https://leetcode.com/problems/candy/"},
-    ],
-    "Disjoint Set / Union-Find": [
-        {"title": "Redundant Connection", "difficulty": "Medium", "url": "https://leetcode.com/problems/redundant-connection/"},
-        {"title": "Number of Provinces", "difficulty": "Medium", "url": "https://leetcode.com/problems/number-of-provinces/"},
-        {"title": "Accounts Merge", "difficulty": "Medium", "url": "https://leetcode.com/problems/accounts-merge/"},
-        {"title": "Graph Valid Tree", "difficulty": "Medium", "url": "https://leetcode.com/problems/graph-valid-tree/"},
-        {"title": "Evaluate Division", "difficulty": "Medium", "url": "https://leetcode.com/problems/evaluate-division/"},
-        {"title": "Smallest String With Swaps", "difficulty": "Medium", "url": "https://leetcode.com/problems/smallest-string-with-swaps/"},
-        {"title": "Most Stones Removed with Same Row or Column", "difficulty": "Medium", "url": "https://leetcode.com/problems/most-stones-removed-with-same-row-or-column/"},
-    ],
-    "Topological Sort": [
-        {"title": "Course Schedule", "difficulty": "Medium", "url": "https://leetcode.com/problems/course-schedule/"},
-        {"title": "Course Schedule II", "difficulty": "Medium", "url": "https://leetcode.com/problems/course-schedule-ii/"},
-        {"title": "Alien Dictionary", "difficulty": "Hard", "url": "https://leetcode.com/problems/alien-dictionary/"},
-        {"title": "Parallel Courses", "difficulty": "Medium", "url": "https://leetcode.com/problems/parallel-courses/"},
-        {"title": "Sequence Reconstruction", "difficulty": "Medium", "url": "https://leetcode.com/problems/sequence-reconstruction/"},
-    ],
-    "Priority Queue / Heap": [
-        {"title": "Kth Largest Element in an Array", "difficulty": "Medium", "url": "https://leetcode.com/problems/kth-largest-element-in-an-array/"},
-        {"title": "Top K Frequent Elements", "difficulty": "Medium", "url": "https://leetcode.com/problems/top-k-frequent-elements/"},
-        {"title": "Task Scheduler", "difficulty": "Medium", "url": "https://leetcode.com/problems/task-scheduler/"},
-        {"title": "Merge k Sorted Lists", "difficulty": "Hard", "url": "https://leetcode.com/problems/merge-k-sorted-lists/"},
-        {"title": "Find Median from Data Stream", "difficulty": "Hard", "url": "https://leetcode.com/problems/find-median-from-data-stream/"},
-        {"title": "K Closest Points to Origin", "difficulty": "Medium", "url": "https://leetcode.com/problems/k-closest-points-to-origin/"},
-        {"title": "Reorganize String", "difficulty": "Medium", "url": "https://leetcode.com/problems/reorganize-string/"},
-    ],
-    "Prefix Sum / Difference Array": [
-        {"title": "Range Sum Query - Immutable", "difficulty": "Easy", "url": "https://leetcode.com/problems/range-sum-query-immutable/"},
-        {"title": "Subarray Sum Equals K", "difficulty": "Medium", "url": "https://leetcode.com/problems/subarray-sum-equals-k/"},
-        {"title": "Continuous Subarray Sum", "difficulty": "Medium", "url": "https://leetcode.com/problems/continuous-subarray-sum/"},
-        {"title": "Find Pivot Index", "difficulty": "Easy", "url": "https://leetcode.com/problems/find-pivot-index/"},
-        {"title": "Longest Subarray of 1's After Deleting One Element", "difficulty": "Medium", "url": "https://leetcode.com/problems/longest-subarray-of-1s-after-deleting-one-element/"},
-        {"title": "Minimum Value to Get Positive Step by Step Sum", "difficulty": "Easy", "url": "https://leetcode.com/problems/minimum-value-to-get-positive-step-by-step-sum/"},
-    ],
-    "Monotonic Stack / Queue": [
-        {"title": "Daily Temperatures", "difficulty": "Medium", "url": "https://leetcode.com/problems/daily-temperatures/"},
-        {"title": "Next Greater Element I", "difficulty": "Easy", "url": "https://leetcode.com/problems/next-greater-element-i/"},
-        {"title": "Next Greater Element II", "difficulty": "Medium", "url": "https://leetcode.com/problems/next-greater-element-ii/"},
-        {"title": "Largest Rectangle in Histogram", "difficulty": "Hard", "url": "https://leetcode.com/problems/largest-rectangle-in-histogram/"},
-        {"title": "Maximal Rectangle", "difficulty": "Hard", "url": "https://leetcode.com/problems/maximal-rectangle/"},
-        {"title": "Trapping Rain Water", "difficulty": "Hard", "url": "https://leetcode.com/problems/trapping-rain-water/"},
-        {"title": "Remove K Digits", "difficulty": "Medium", "url": "https://leetcode.com/problems/remove-k-digits/"},
-    ],
-    "Trie": [
-        {"title": "Implement Trie (Prefix Tree)", "difficulty": "Medium", "url": "https://leetcode.com/problems/implement-trie-prefix-tree/"},
-        {"title": "Design Add and Search Words Data Structure", "difficulty": "Medium", "url": "https://leetcode.com/problems/design-add-and-search-words-data-structure/"},
-        {"title": "Word Search II", "difficulty": "Hard", "url": "https://leetcode.com/problems/word-search-ii/"},
-        {"title": "Replace Words", "difficulty": "Medium", "url": "https://leetcode.com/problems/replace-words/"},
-        {"title": "Longest Word in Dictionary", "difficulty": "Medium", "url": "https://leetcode.com/problems/longest-word-in-dictionary/"},
-        {"title": "Design Search Autocomplete System", "difficulty": "Hard", "url": "https://leetcode.com/problems/design-search-autocomplete-system/"},
-    ],
-    "Interval Scheduling": [
-        {"title": "Non-overlapping Intervals", "difficulty": "Medium", "url": "https://leetcode.com/problems/non-overlapping-intervals/"},
-        {"title": "Insert Interval", "difficulty": "Medium", "url": "https://leetcode.com/problems/insert-interval/"},
-        {"title": "Meeting Rooms II", "difficulty": "Medium", "url": "https://leetcode.com/problems/meeting-rooms-ii/"},
-        {"title": "Minimum Number of Arrows to Burst Balloons", "difficulty": "Medium", "url": "https://leetcode.com/problems/minimum-number-of-arrows-to-burst-balloons/"},
-        {"title": "Merge Intervals", "difficulty": "Medium", "url": "https://leetcode.com/problems/merge-intervals/"},
-        {"title": "Car Pooling", "difficulty": "Medium", "url": "https://leetcode.com/problems/car-pooling/"},
-    ],
-    "Segment Tree / Fenwick": [
-        {"title": "Range Sum Query - Mutable", "difficulty": "Medium", "url": "https://leetcode.com/problems/range-sum-query-mutable/"},
-        {"title": "Count of Smaller Numbers After Self", "difficulty": "Hard", "url": "https://leetcode.com/problems/count-of-smaller-numbers-after-self/"},
-        {"title": "Reverse Pairs", "difficulty": "Hard", "url": "https://leetcode.com/problems/reverse-pairs/"},
-        {"title": "Longest Increasing Subsequence", "difficulty": "Medium", "url": "https://leetcode.com/problems/longest-increasing-subsequence/"},
-        {"title": "K-th Smallest Prime Fraction", "difficulty": "Hard", "url": "https://leetcode.com/problems/k-th-smallest-prime-fraction/"},
-    ],
-}
+
+@functools.cache
+def _library_index() -> Dict[str, Tuple[Tuple[str, Problem], ...]]:
+    """Enrichment index: pattern -> ((casefolded title, problem), ...)."""
+    return {
+        name: tuple((p.title.casefold(), p) for p in problems)
+        for name, problems in _fallback_data()[1].items()
+    }
+
+
+def __getattr__(name: str) -> Any:
+    if name == "LOCAL_MINIMAL_FALLBACK":
+        return _fallback_data()[0]
+    if name == "PROBLEM_LIBRARY":
+        return _fallback_data()[1]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def scrape_patterns(
@@ -538,145 +189,295 @@ def scrape_patterns(
     session: requests.Session | None = None,
     allow_fallback: bool = True,
     fallback_url: str | None = None,
+    force_refresh: bool = False,
+    prefer_raw_json: bool = True,
 ) -> List[Dict[str, Any]]:
-    """Fetch and normalize patterns from the target site."""
+    """Fetch and normalize patterns from the target site.
+
+    With prefer_raw_json (and allow_fallback), the canonical JSON source is
+    tried first and the base-site HTML is only fetched if that fails. This
+    applies only when the base site is DEFAULT_BASE_SITE, whose data that JSON
+    is; any other base_url / BASE_SITE is always scraped first.
+    Results are cached on disk for CACHE_TTL_SECONDS; pass force_refresh=True
+    to bypass the cache and hit the network.
+    """
     base_url = base_url or load_base_site()
-    sess = session or requests.Session()
-    html = None
-    try:
-        html = fetch_html(sess, base_url)
-    except Exception:
-        html = None
-
-    next_data = extract_next_data(html) if html else None
-    patterns = extract_patterns_from_next_data(next_data) if next_data else []
-
-    if not patterns and html:
-        patterns = extract_patterns_from_html(html)
-
-    if not patterns and allow_fallback:
-        patterns = (
-            fetch_fallback_patterns(sess, fallback_url=fallback_url)
-            or load_local_fallback()
-            or LOCAL_MINIMAL_FALLBACK
-        )
-
-    # Merge in optional additional sources if provided via env or defaults.
-    patterns += fetch_additional_sources(sess, base_url=base_url)
+    raw_json_first = (
+        prefer_raw_json
+        and allow_fallback
+        and base_url.rstrip("/") == DEFAULT_BASE_SITE.rstrip("/")
+    )
+    cache_key = [
+        base_url,
+        _resolve_fallback_url(fallback_url),
+        allow_fallback,
+        raw_json_first,
+        *_additional_source_urls(),
+    ]
+    if not force_refresh:
+        cached = _read_cache(cache_key)
+        if cached is not None:
+            return cached
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    sess = session or _default_session()
+
+    # Additional sources do not depend on the primary scrape, so fetch them
+    # in the background while the base site / fallback chain runs.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        extra_future = executor.submit(_fetch_additional_sources, sess)
+
+        patterns: List[Mapping[str, Any]] = []
+        if raw_json_first:
+            patterns = fetch_fallback_patterns(sess, fallback_url=fallback_url)
+
+        if not patterns:
+            html = None
+            try:
+                html = fetch_html(sess, base_url)
+            except Exception:
+                html = None
+
+            next_data = extract_next_data(html) if html else None
+            patterns = extract_patterns_from_next_data(next_data) if next_data else []
+
+            # A Next.js page whose payload has no pattern list is a schema
+            # mismatch; its rendered HTML would only yield heuristic noise.
+            if not patterns and html and next_data is None:
+                patterns = extract_patterns_from_html(html)
+
+        if not patterns and allow_fallback and not raw_json_first:
+            patterns = fetch_fallback_patterns(sess, fallback_url=fallback_url)
+
+        # Only cache results backed by a successful network fetch.
+        cacheable = bool(patterns)
+        if not patterns and allow_fallback:
+            patterns = load_local_fallback() or [_as_dict(p) for p in _fallback_data()[0]]
+
+        # Merge in optional additional sources if provided via env or defaults.
+        extra, extra_complete = extra_future.result()
+        patterns = list(patterns) + extra
 
     normalized = [normalize_pattern(entry, base_url) for entry in patterns]
     normalized = dedupe_patterns([p for p in normalized if p["pattern"] and p["problems"]])
     normalized = enrich_problem_lists(normalized, min_count=8)
+    if cacheable:
+        # Keep a partial result only briefly so a failed source is retried soon.
+        ttl = CACHE_TTL_SECONDS if extra_complete else PARTIAL_CACHE_TTL_SECONDS
+        _write_cache(cache_key, normalized, ttl=ttl)
     return normalized
 
 
+def _cache_path() -> str:
+    cache_dir = os.getenv(CACHE_DIR_ENV) or os.path.join(
+        os.path.expanduser("~"), ".cache", "leetcode_patterns"
+    )
+    return os.path.join(cache_dir, "patterns.json")
+
+
+def _read_cache(key: List[Any]) -> List[Dict[str, Any]] | None:
+    """Return cached patterns for key if the cache file is fresh, else None."""
+    path = _cache_path()
+    try:
+        age = time.time() - os.path.getmtime(path)
+        if age > CACHE_TTL_SECONDS:
+            return None
+        with open(path, "rb") as f:
+            cached = _loads(f.read())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("key") != key:
+        return None
+    if age > cached.get("ttl", CACHE_TTL_SECONDS):  # partial results expire sooner
+        return None
+    return cached.get("patterns")
+
+
+def _write_cache(key: List[Any], patterns: List[Dict[str, Any]], *, ttl: int = CACHE_TTL_SECONDS) -> None:
+    """Persist patterns atomically; caching is best-effort and never raises."""
+    path = _cache_path()
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            f.write(_dumps({"key": key, "ttl": ttl, "patterns": patterns}))
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
 def load_base_site(env_path: str = ".env") -> str:
     """Load BASE_SITE from env or .env fallback."""
     env_val = os.getenv("BASE_SITE")
     if env_val:
         return env_val
-    if os.path.exists(env_path):
-        with open(env_path, "r", encoding="utf-8") as f:
-            for line in f:
-                if line.strip().startswith("BASE_SITE"):
-                    _, value = line.split("=", 1)
-                    return value.strip().strip('"').strip("'")
-    return DEFAULT_BASE_SITE
+    return _base_site_from_env_file(env_path) or DEFAULT_BASE_SITE
+
+
+# Horizontal whitespace only: an empty value must not run on into the next line.
+_BASE_SITE_RE = re.compile(r"^[^\S\n]*BASE_SITE[^\S\n]*=[^\S\n]*(.*)$", re.MULTILINE)
+
+
+@functools.lru_cache(maxsize=4)
+def _base_site_from_env_file(env_path: str) -> str | None:
+    """Read BASE_SITE from a .env file once per path."""
+    if not os.path.exists(env_path):
+        return None
+    with open(env_path, "r", encoding="utf-8") as f:
+        match = _BASE_SITE_RE.search(f.read())
+    if not match:
+        return None
+    return match.group(1).strip().strip('"').strip("'") or None
 
 
 def fetch_html(session: requests.Session, url: str) -> str:
     """Fetch raw HTML from the base site."""
-    headers = {
-        "User-Agent": "leetcode-patterns-aggregator/0.1 (+https://github.com/)",
-    }
-    resp = session.get(url, headers=headers, timeout=30)
-    resp.raise_for_status()
-    return resp.text
+    headers = {"User-Agent": USER_AGENT}
+    # Stream into one growing buffer so the body is held once as bytes and
+    # decoded once, rather than also being joined by requests' `.content`.
+    with session.get(url, headers=headers, timeout=30, stream=True) as resp:
+        resp.raise_for_status()
+        buf = bytearray()
+        for chunk in resp.iter_content(chunk_size=64 * 1024):
+            buf += chunk
+        return _decode_body(resp, buf)
+
+
+def _decode_body(resp: requests.Response, body: bytes | bytearray | None = None) -> str:
+    """Decode a response body without requests' charset sniffing.
+
+    `resp.text` falls back to chardet detection (slow on large pages) or to
+    ISO-8859-1 for text/* without a charset; use the declared charset if any,
+    otherwise UTF-8.
+    """
+    if body is None:
+        body = resp.content
+    content_type = resp.headers.get("Content-Type", "").lower()
+    encoding = (resp.encoding if "charset=" in content_type else None) or "utf-8"
+    try:
+        return body.decode(encoding, errors="replace")
+    except LookupError:  # unknown charset label
+        return body.decode("utf-8", errors="replace")
 
 
 def extract_next_data(html: str) -> Any | None:
     """Pull the __NEXT_DATA__ payload if present (common for Next.js sites)."""
-    match = re.search(
-        r'<script[^>]+id="__NEXT_DATA__"[^>]*>(.*?)</script>', html, re.DOTALL
-    )
+    idx = html.find("__NEXT_DATA__")
+    if idx < 0:  # cheap miss for non-Next.js pages; skips the DOTALL regex
+        return None
+    match = _NEXT_DATA_RE.search(html, max(html.rfind("<script", 0, idx), 0))
     if not match:
         return None
-    script_body = unescape(match.group(1))
+    script_body = _maybe_unescape(match.group(1))
     try:
-        return json.loads(script_body)
-    except json.JSONDecodeError:
+        return _loads(script_body)
+    except ValueError:
         return None
 
 
-def extract_patterns_from_next_data(next_data: Any) -> List[Mapping[str, Any]]:
-    """Search recursively for a list of pattern objects in Next.js data."""
-    patterns: List[Mapping[str, Any]] = []
-
-    def looks_like_pattern_list(node: Any) -> bool:
-        return bool(
-            isinstance(node, list)
-            and node
-            and all(
-                isinstance(item, dict)
-                and any(k in item for k in ("pattern", "name", "title"))
-                and ("problems" in item or "questions" in item)
-                for item in node
-            )
-        )
+def _looks_like_pattern_list(node: Any) -> bool:
+    # The first item decides the shape; every item must still be a dict, since
+    # normalize_pattern is applied to each one.
+    if not (isinstance(node, list) and node and isinstance(node[0], dict)):
+        return False
+    first = node[0]
+    return (
+        not _PATTERN_KEYS.isdisjoint(first)
+        and not _PROBLEM_KEYS.isdisjoint(first)
+        and all(isinstance(item, dict) for item in node)
+    )
 
-    def walk(node: Any):
-        nonlocal patterns
-        if patterns:
-            return
-        if looks_like_pattern_list(node):
-            patterns = node  # type: ignore[assignment]
-            return
-        if isinstance(node, list):
-            for item in node:
-                walk(item)
-        elif isinstance(node, dict):
-            if "patterns" in node and looks_like_pattern_list(node["patterns"]):
-                patterns = node["patterns"]  # type: ignore[assignment]
-                return
-            if "leetcodePatterns" in node and looks_like_pattern_list(
-                node["leetcodePatterns"]
-            ):
-                patterns = node["leetcodePatterns"]  # type: ignore[assignment]
-                return
-            for value in node.values():
-                walk(value)
-
-    walk(next_data)
-    return patterns
+
+def extract_patterns_from_next_data(next_data: Any) -> List[Mapping[str, Any]]:
+    """Search depth-first for a list of pattern objects in Next.js data."""
+    # Explicit stack instead of recursion; children are pushed reversed so the
+    # first match is the same one a pre-order walk would find.
+    stack = [next_data]
+    while stack:
+        node = stack.pop()
+        # Decoded JSON only holds exact list/dict instances, so identity checks suffice.
+        kind = type(node)
+        if kind is list:
+            if _looks_like_pattern_list(node):
+                return node
+            stack.extend(reversed(node))
+        elif kind is dict:
+            for key in ("patterns", "leetcodePatterns"):
+                if key in node and _looks_like_pattern_list(node[key]):
+                    return node[key]
+            stack.extend(reversed(node.values()))
+    return []
 
 
 def extract_patterns_from_html(html: str) -> List[Mapping[str, Any]]:
     """Fallback HTML scraping when __NEXT_DATA__ is not present.
 
     Heuristic: looks for header tags (<h2>/<h3>) followed by <li> items.
+    Uses selectolax when installed, otherwise a regex scan.
     """
-    pattern_blocks: List[Dict[str, Any]] = []
-    header_iter = re.finditer(r"<h[23][^>]*>(.*?)</h[23]>", html, re.IGNORECASE | re.DOTALL)
-    headers = [unescape(strip_tags(m.group(1))).strip() for m in header_iter]
-
-    # Split the page into segments after each header for basic association.
-    segments = re.split(r"<h[23][^>]*>.*?</h[23]>", html, flags=re.IGNORECASE | re.DOTALL)
-    for name, segment in zip(headers, segments[1:]):  # first split is pre-header noise
-        problems = []
-        for li in re.finditer(r"<li[^>]*>(.*?)</li>", segment, re.IGNORECASE | re.DOTALL):
-            text = unescape(strip_tags(li.group(1))).strip()
-            if not text:
-                continue
-            problems.append({"title": text, "difficulty": "Unknown", "url": ""})
-        if name and problems:
-            pattern_blocks.append({"pattern": name, "problems": problems})
+    if LexborHTMLParser is not None:
+        return _extract_patterns_from_html_tree(html)
+
+    if "\x00" in html:  # NUL separates fragments below; browsers render it as U+FFFD
+        html = html.replace("\x00", "\ufffd")
+    is_header: List[bool] = []
+    fragments: List[str] = []
+    # One left-to-right scan; each match is either a header or a list item.
+    for match in _BLOCK_RE.finditer(html):
+        header = match.group("header")
+        is_header.append(header is not None)
+        fragments.append(header if header is not None else match.group("item"))
+    if not fragments:
+        return []
+    # Strip tags and decode entities for every fragment in one call each.
+    # _TAG_RE never matches across a NUL and unescape never produces one
+    # (&#0; becomes U+FFFD), so the joined fragments split back apart cleanly.
+    joined = _maybe_unescape(_TAG_RE.sub(" ", "\x00".join(fragments)))
+    texts = joined.split("\x00")
 
-    return pattern_blocks
+    pattern_blocks: List[Dict[str, Any]] = []
+    current: Dict[str, Any] | None = None
+    for header, raw in zip(is_header, texts):
+        text = raw.strip()
+        if header:
+            current = {"pattern": text, "problems": []}
+            pattern_blocks.append(current)
+        elif current is not None and text:  # items before the first header are noise
+            current["problems"].append({"title": text, "difficulty": "Unknown", "url": ""})
+    return [block for block in pattern_blocks if block["pattern"] and block["problems"]]
+
+
+def _extract_patterns_from_html_tree(html: str) -> List[Mapping[str, Any]]:
+    """Same heuristic as the regex scan, on a selectolax DOM."""
+    pattern_blocks: List[Dict[str, Any]] = []
+    current: Dict[str, Any] | None = None
+    # CSS selector lists match in document order, so each <li> follows its header.
+    for node in LexborHTMLParser(html).css("h2, h3, li"):
+        if node.tag == "li" and _inside_li(node):
+            continue  # the regex scan folds nested items into their parent
+        # Match the regex path: tags become spaces, entities are decoded, ends stripped.
+        text = _maybe_unescape(_TAG_RE.sub(" ", node.html or "")).strip()
+        if node.tag in ("h2", "h3"):
+            current = {"pattern": text, "problems": []}
+            pattern_blocks.append(current)
+        elif current is not None and text:
+            current["problems"].append({"title": text, "difficulty": "Unknown", "url": ""})
+    return [block for block in pattern_blocks if block["pattern"] and block["problems"]]
+
+
+def _inside_li(node: Any) -> bool:
+    parent = node.parent
+    while parent is not None:
+        if parent.tag == "li":
+            return True
+        parent = parent.parent
+    return False
 
 
 def normalize_pattern(entry: Mapping[str, Any], base_url: str) -> Dict[str, Any]:
     """Normalize scraped entry to the expected shape."""
-    name = entry.get("pattern") or entry.get("name") or entry.get("title") or ""
+    name = sys.intern(str(entry.get("pattern") or entry.get("name") or entry.get("title") or ""))
     url = (
         entry.get("url")
         or entry.get("link")
@@ -688,28 +489,48 @@ def normalize_pattern(entry: Mapping[str, Any], base_url: str) -> Dict[str, Any]
 
 
 def normalize_problems(problems: Iterable[Mapping[str, Any]]) -> List[Dict[str, str]]:
-    """Normalize problem entries, keeping title/difficulty/url."""
+    """Normalize problem entries, keeping title/difficulty/url.
+
+    Duplicate entries (same title and url) are dropped, keeping the first.
+    """
     normalized: List[Dict[str, str]] = []
+    append = normalized.append
+    seen = set()
+    add_seen = seen.add
+    intern = sys.intern
     for p in problems:
-        title = p.get("title") or p.get("name") or p.get("question") or "Unknown Problem"
-        difficulty = p.get("difficulty") or p.get("level") or p.get("tier") or "Unknown"
-        url = p.get("url") or p.get("link") or p.get("leetcode_url") or ""
+        get = p.get
+        title = get("title") or get("name") or get("question") or "Unknown Problem"
+        # Difficulties repeat across every problem; intern so they share one object.
+        difficulty = get("difficulty") or get("level") or get("tier") or "Unknown"
+        if type(difficulty) is str:
+            difficulty = intern(difficulty)
+        url = get("url") or get("link") or get("leetcode_url") or ""
         if not url and title:
-            slug = slugify(title)
-            url = f"https://leetcode.com/problems/{slug}/"
-        normalized.append({"title": title, "difficulty": difficulty, "url": url})
+            url = f"https://leetcode.com/problems/{slugify(title)}/"
+        key = (title, url)
+        if key in seen:
+            continue
+        add_seen(key)
+        append({"title": title, "difficulty": difficulty, "url": url})
     return normalized
 
 
+def _maybe_unescape(text: str) -> str:
+    """html.unescape, skipped for the common case of text without entities."""
+    return unescape(text) if "&" in text else text
+
+
 def strip_tags(raw_html: str) -> str:
     """Remove HTML tags from a string."""
-    return re.sub(r"<[^>]+>", " ", raw_html)
+    return _TAG_RE.sub(" ", raw_html)
 
 
+@functools.lru_cache(maxsize=4096)
 def slugify(value: str) -> str:
     """Very small slugifier; lowercases and replaces spaces with hyphens."""
     value = value.strip().lower()
-    value = re.sub(r"[^a-z0-9]+", "-", value)
+    value = _SLUG_RE.sub("-", value)
     return value.strip("-")
 
 
@@ -717,11 +538,14 @@ def fetch_fallback_patterns(
     session: requests.Session, *, fallback_url: str | None = None
 ) -> List[Mapping[str, Any]]:
     """Fetch patterns from a known JSON source as a fallback."""
-    url = fallback_url or os.getenv("FALLBACK_PATTERNS_URL") or FALLBACK_PATTERNS_URL
+    url = _resolve_fallback_url(fallback_url)
     try:
-        resp = session.get(url, timeout=30)
-        resp.raise_for_status()
-        data = resp.json()
+        # Stream so error responses are never downloaded and the connection
+        # goes back to the pool as soon as the body has been read.
+        with session.get(url, timeout=30, stream=True) as resp:
+            resp.raise_for_status()
+            body = resp.content
+        data = _loads(body)
         if isinstance(data, list):
             return data
     except Exception:
@@ -731,70 +555,102 @@ def fetch_fallback_patterns(
 
 def fetch_additional_sources(session: requests.Session, *, base_url: str | None = None) -> List[Mapping[str, Any]]:
     """Fetch extra pattern data from provided URLs (JSON or HTML with __NEXT_DATA__)."""
+    return _fetch_additional_sources(session)[0]
+
+
+def _fetch_additional_sources(session: requests.Session) -> Tuple[List[Mapping[str, Any]], bool]:
+    """Fetch every additional source; the flag is False if any fetch failed."""
+    urls = _additional_source_urls()
+    if len(urls) == 1:  # the default configuration; a pool would only add overhead
+        batches = [_fetch_additional_source(session, urls[0])]
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(urls))) as executor:
+            # executor.map yields in submission order, keeping the merge deterministic.
+            batches = list(executor.map(lambda url: _fetch_additional_source(session, url), urls))
+    patterns = [pattern for batch in batches if batch for pattern in batch]
+    return patterns, all(batch is not None for batch in batches)
+
+
+def _resolve_fallback_url(fallback_url: str | None = None) -> str:
+    return fallback_url or os.getenv("FALLBACK_PATTERNS_URL") or FALLBACK_PATTERNS_URL
+
+
+@functools.cache
+def _additional_source_urls() -> Tuple[str, ...]:
+    """Resolve ADDITIONAL_PATTERNS_URLS once; call .cache_clear() after changing it."""
     urls_env = os.getenv(ADDITIONAL_SOURCES_ENV, "")
     urls = [u.strip() for u in urls_env.split(",") if u.strip()] or DEFAULT_ADDITIONAL_SOURCES
-    results: List[Mapping[str, Any]] = []
-    for url in urls:
-        try:
-            resp = session.get(url, timeout=30)
-            resp.raise_for_status()
-            content_type = resp.headers.get("Content-Type", "")
-            if "application/json" in content_type:
-                data = resp.json()
-                if isinstance(data, list):
-                    results.extend(data)
-                continue
+    return tuple(urls)
 
-            # Try Next.js payload from HTML.
-            html = resp.text
-            next_data = extract_next_data(html)
-            if next_data:
-                patterns = extract_patterns_from_next_questions(next_data, source_url=url)
-                results.extend(patterns)
-        except Exception:
-            continue
-    return results
+
+def _fetch_additional_source(session: requests.Session, url: str) -> List[Mapping[str, Any]] | None:
+    """Fetch a single additional source; a failed fetch yields None."""
+    try:
+        with session.get(url, timeout=30, stream=True) as resp:
+            resp.raise_for_status()
+            is_json = "application/json" in resp.headers.get("Content-Type", "")
+            body = resp.content if is_json else _decode_body(resp)
+        if is_json:
+            data = _loads(body)
+            return data if isinstance(data, list) else []
+
+        # Try Next.js payload from HTML.
+        next_data = extract_next_data(body)
+        if next_data:
+            return extract_patterns_from_next_questions(next_data, source_url=url)
+    except Exception:
+        return None
+    return []
 
 
 def dedupe_patterns(patterns: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Deduplicate by pattern name, preserving first occurrence."""
-    seen = set()
-    deduped = []
+    by_key: Dict[str, Dict[str, Any]] = {}
+    setdefault = by_key.setdefault
     for p in patterns:
-        key = p.get("pattern", "").lower()
-        if key in seen:
-            continue
-        seen.add(key)
-        deduped.append(p)
-    return deduped
+        setdefault(p.get("pattern", "").casefold(), p)
+    return list(by_key.values())
 
 
 def enrich_problem_lists(patterns: List[Dict[str, Any]], min_count: int = 8) -> List[Dict[str, Any]]:
     """Ensure each pattern has at least min_count problems using the library."""
+    index = _library_index()
     for pattern in patterns:
-        name = pattern.get("pattern", "")
-        library = PROBLEM_LIBRARY.get(name)
+        library = index.get(pattern.get("pattern", ""))
         if not library:
             continue
-        existing_titles = {pr.get("title", "").lower() for pr in pattern.get("problems", [])}
-        for candidate in library:
-            title = candidate.get("title", "")
-            if title.lower() in existing_titles:
+        problems = pattern.setdefault("problems", [])
+        if len(problems) >= min_count:
+            continue
+        existing_titles = {pr.get("title", "").casefold() for pr in problems}
+        add_title = existing_titles.add
+        append = problems.append
+        for title_key, candidate in library:
+            if title_key in existing_titles:
                 continue
-            pattern.setdefault("problems", []).append(candidate.copy())
-            existing_titles.add(title.lower())
-            if len(pattern["problems"]) >= min_count:
+            append(candidate._asdict())
+            add_title(title_key)
+            if len(problems) >= min_count:
                 break
     return patterns
 
 
+def _as_dict(pattern: Pattern) -> Dict[str, Any]:
+    """Convert a built-in Pattern record to the dict shape returned by scrape_patterns."""
+    record = pattern._asdict()
+    record["problems"] = [p._asdict() for p in pattern.problems]
+    return record
+
+
 def extract_patterns_from_next_questions(next_data: Any, source_url: str | None = None) -> List[Mapping[str, Any]]:
     """Heuristic extraction: gather questions and group by tag/topic."""
     questions = _collect_questions(next_data, source_url=source_url)
     if not questions:
         return []
 
-    grouped: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    grouped: Dict[str, List[Dict[str, Any]]] = {}
     for q in questions:
         tags = q.get("tags") or q.get("topics") or q.get("categories") or []
         tag_names = []
@@ -806,8 +662,14 @@ def extract_patterns_from_next_questions(next_data: Any, source_url: str | None
         if not tag_names:
             tag_names = ["General"]
         for tag in tag_names:
-            if tag:
-                grouped[tag].append(q)
+            if not tag:
+                continue
+            # Single lookup per tag; only the first hit allocates a list.
+            bucket = grouped.get(tag)
+            if bucket is None:
+                grouped[tag] = [q]
+            else:
+                bucket.append(q)
 
     patterns = []
     for tag, probs in grouped.items():
@@ -835,7 +697,7 @@ def _collect_questions(node: Any, *, source_url: str | None = None) -> List[Dict
             else:
                 url = f"https://leetcode.com/problems/{slug}/"
         tags = d.get("tags") or d.get("topics") or d.get("topicTags") or []
-        if isinstance(tags, dict):
+        if type(tags) is dict:
             tags = list(tags.values())
         return {
             "title": title,
@@ -844,17 +706,29 @@ def _collect_questions(node: Any, *, source_url: str | None = None) -> List[Dict
             "tags": tags,
         }
 
-    def walk(x: Any):
-        if isinstance(x, list):
-            for item in x:
-                walk(item)
-        elif isinstance(x, dict):
+    # Known payload locations first: when one holds questions, the rest of
+    # the tree (build manifests, i18n blobs, ...) is never visited.
+    for path in _QUESTION_PATHS:
+        candidate = node
+        for key in path:
+            candidate = candidate.get(key) if type(candidate) is dict else None
+        if type(candidate) is list:
+            found = [normalize_question(q) for q in candidate if type(q) is dict and is_question(q)]
+            if found:
+                return found
+
+    found_append = found.append
+    stack = [node]
+    pop, extend = stack.pop, stack.extend
+    while stack:
+        x = pop()
+        kind = type(x)
+        if kind is list:
+            extend(reversed(x))
+        elif kind is dict:
             if is_question(x):
-                found.append(normalize_question(x))
-            for v in x.values():
-                walk(v)
-
-    walk(next_data)
+                found_append(normalize_question(x))
+            extend(reversed(x.values()))
     return found
 
 
@@ -864,10 +738,10 @@ def load_local_fallback() -> List[Mapping[str, Any]]:
     if not file_path or not os.path.exists(file_path):
         return []
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            if isinstance(data, list):
-                return data
+        with open(file_path, "rb") as f:
+            data = _loads(f.read())
+        if isinstance(data, list):
+            return data
     except Exception:
         return []
     return []
@@ -875,6 +749,7 @@ def load_local_fallback() -> List[Mapping[str, Any]]:
 
 __all__ = [
     "scrape_patterns",
+    "build_session",
     "load_base_site",
     "extract_next_data",
     "extract_patterns_from_next_data",
@@ -888,4 +763,6 @@ __all__ = [
     "fetch_additional_sources",
     "extract_patterns_from_next_questions",
     "PROBLEM_LIBRARY",
+    "Problem",
+    "Pattern",
 ]
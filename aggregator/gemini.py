@@ -17,21 +17,94 @@ be passed directly to the sheet_populator module for upload.
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import io
+import itertools
 import os
-from typing import Any, Dict, List, Mapping, Sequence
+import random
+import re
+import time
+from typing import Any, AsyncIterator, Dict, List, Mapping, Sequence, Tuple
 
+import httpx
 from google import genai
+from google.genai import types
 from google.genai.errors import ClientError
 
+from aggregator.llm_cache import PromptCache
+
+try:  # orjson is an optional, faster drop-in for the batch JSONL and JSON replies.
+    from orjson import dumps as _dumps, loads as _loads
+except ImportError:
+    from json import loads as _loads
+
+    def _dumps(obj: Any) -> bytes:
+        import json
+
+        return json.dumps(obj).encode("utf-8")
+
 # Default to Gemini 2.0 flash; can be overridden via GEMINI_MODEL env or constructor.
 DEFAULT_MODEL = "gemini-2.0-flash"
 DEFAULT_TEMPERATURE = 0.35
+HINTS_TEMPERATURE = 0.2
+# Upper bound on in-flight summary requests; override via GEMINI_CONCURRENCY.
+CONCURRENCY_ENV = "GEMINI_CONCURRENCY"
+DEFAULT_CONCURRENCY = 10
+# Transient statuses the SDK retries with exponential backoff and jitter.
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+RETRY_ATTEMPTS = 5
+# Extra waits on a 429 that names its own retry delay (the SDK backoff ignores it).
+QUOTA_RETRY_ATTEMPTS = 2
+QUOTA_MAX_DELAY_SECONDS = 120.0
+_RETRY_DELAY_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)s\s*$")
+# Patterns packed into one prompt (one request per group); override via GEMINI_MARSHAL_BATCH.
+MARSHAL_BATCH_ENV = "GEMINI_MARSHAL_BATCH"
+DEFAULT_MARSHAL_BATCH = 8
+# PromptCache variant for summaries taken from a marshaled (multi-pattern) reply.
+MARSHALED_CACHE_VARIANT = "marshaled"
+# Pooled keep-alive connections for concurrent requests; override via GEMINI_CONN_LIMIT.
+CONN_LIMIT_ENV = "GEMINI_CONN_LIMIT"
+DEFAULT_CONN_LIMIT = 64
+KEEPALIVE_SECONDS = 60.0
+# Batch API jobs trade latency (minutes to hours) for roughly half the cost.
+BATCH_DISPLAY_NAME = "leetcode-patterns"
+BATCH_POLL_SECONDS = 10.0
+BATCH_MAX_POLL_SECONDS = 60.0
+_BATCH_FAILED_STATES = frozenset(
+    ("JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED")
+)
+_PROMPT_TEMPLATE = (
+    "You are summarizing a LeetCode pattern for a study sheet.\n"
+    "{block}\n\n"
+    "Write a crisp 1-2 sentence description that explains the core idea, when to use it, "
+    "and the intuition a learner should remember. Avoid verbosity and avoid code. "
+    "Keep it under 420 characters."
+)
+_PATTERN_BLOCK_TEMPLATE = (
+    "Pattern: {pattern_name}\n"
+    "Context: {notes}\n"
+    "Representative problems:\n{problems}"
+)
+# Configured model name -> name confirmed by a models.get probe (see _ensure_model).
+_VALIDATED_MODELS: Dict[str, str] = {}
+_JSON_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$")
+
+
+class BatchUnavailable(RuntimeError):
+    """A Batch API job ended without results (failed, cancelled or expired)."""
 
 
 class GeminiSummarizer:
     """Wraps the Gemini client and provides helpers to summarize patterns."""
 
-    def __init__(self, api_key: str | None = None, model: str | None = None):
+    def __init__(
+        self,
+        api_key: str | None = None,
+        model: str | None = None,
+        *,
+        cache: PromptCache | None = None,
+    ):
         self.api_key = (
             api_key or os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
         )
@@ -42,7 +115,36 @@ class GeminiSummarizer:
             )
         env_model = os.getenv("GEMINI_MODEL")
         self.model = model or env_model or DEFAULT_MODEL
-        self.client = genai.Client(api_key=self.api_key)
+        # Optional on-disk prompt cache; summaries for unchanged prompts skip the API.
+        self.cache = cache
+        self.concurrency = max(1, int(os.getenv(CONCURRENCY_ENV) or DEFAULT_CONCURRENCY))
+        self.marshal_batch = max(
+            1, int(os.getenv(MARSHAL_BATCH_ENV) or DEFAULT_MARSHAL_BATCH)
+        )
+        self.client = genai.Client(api_key=self.api_key, http_options=_http_options())
+        # Async client is created per event loop (see _async_client / aclose).
+        self._aio: Any = None
+
+    def _async_client(self):
+        """Async Gemini client sharing one tuned keep-alive connection pool."""
+        if self._aio is None:
+            limit = max(1, int(os.getenv(CONN_LIMIT_ENV) or DEFAULT_CONN_LIMIT))
+            limits = httpx.Limits(
+                max_connections=limit,
+                max_keepalive_connections=limit,
+                keepalive_expiry=KEEPALIVE_SECONDS,
+            )
+            self._aio = genai.Client(
+                api_key=self.api_key,
+                http_options=_http_options(async_client_args={"limits": limits}),
+            ).aio
+        return self._aio
+
+    async def aclose(self) -> None:
+        """Close the async connection pool; the next async call opens a new one."""
+        aio, self._aio = self._aio, None
+        if aio is not None:
+            await aio.aclose()
 
     def summarize_patterns(
         self,
@@ -60,93 +162,512 @@ class GeminiSummarizer:
             "top_problems": short bullet list (as text) of 3 representative problems,
         }
         """
-        results: List[Dict[str, str]] = []
-        for pattern in scraped_patterns:
-            results.append(
-                self._summarize_single(pattern, temperature=temperature),
-            )
+
+        async def run() -> List[Dict[str, str]]:
+            try:
+                return await self.summarize_patterns_async(
+                    scraped_patterns, temperature=temperature
+                )
+            finally:
+                # The pool is bound to this event loop, which asyncio.run closes.
+                await self.aclose()
+
+        return asyncio.run(run())
+
+    async def summarize_patterns_async(
+        self,
+        scraped_patterns: Sequence[Mapping[str, Any]],
+        *,
+        temperature: float = DEFAULT_TEMPERATURE,
+    ) -> List[Dict[str, str]]:
+        """Async summarize_patterns; up to `concurrency` requests run at once.
+
+        Patterns are packed `marshal_batch` to a request. Results are returned
+        in input order.
+        """
+        results: List[Dict[str, str]] = [{} for _ in scraped_patterns]
+        async for index, record in self.iter_summaries_async(
+            scraped_patterns, temperature=temperature
+        ):
+            results[index] = record
         return results
 
-    def _summarize_single(
-        self, pattern: Mapping[str, Any], *, temperature: float
-    ) -> Dict[str, str]:
-        pattern_name = pattern.get("pattern") or "Unknown Pattern"
-        problems = pattern.get("problems") or []
-        notes = pattern.get("notes") or ""
-        url = pattern.get("url") or ""
-
-        prompt = build_prompt(pattern_name, problems, notes)
-        response = self._generate_with_fallback(prompt, temperature)
-
-        summary_text = response.text.strip() if hasattr(response, "text") else ""
-        if not summary_text:
-            summary_text = (
-                f"{pattern_name}: core idea summary unavailable; review pattern notes."
+    async def iter_summaries_async(
+        self,
+        scraped_patterns: Sequence[Mapping[str, Any]],
+        *,
+        temperature: float = DEFAULT_TEMPERATURE,
+    ) -> AsyncIterator[Tuple[int, Dict[str, str]]]:
+        """Yield (input index, summary dict) pairs as soon as each is ready.
+
+        Cached summaries come first, then each request's patterns as it finishes.
+        """
+        await self._aensure_model()
+        prompts = [_pattern_prompt(pattern) for pattern in scraped_patterns]
+        # Marshaled summaries are only reused by runs that marshal too.
+        variants = ("", MARSHALED_CACHE_VARIANT) if self.marshal_batch > 1 else ("",)
+        texts = self._cached_texts(prompts, temperature, variants)
+        for index, text in enumerate(texts):
+            if text is not None:
+                yield index, _summary_record(scraped_patterns[index], text)
+        # Identical prompts (e.g. duplicate patterns) share one request.
+        pending = _pending_by_prompt(prompts, texts)
+        if not pending:
+            return
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run_group(
+            group: Tuple[int, ...],
+        ) -> Tuple[Tuple[int, ...], List[str], str]:
+            texts, variant = await self._summarize_group_async(
+                [scraped_patterns[i] for i in group],
+                [prompts[i] for i in group],
+                temperature=temperature,
+                semaphore=semaphore,
             )
-        return {
-            "pattern": pattern_name,
-            "url": url,
-            "summary": summary_text,
-            "top_problems": format_problems(problems),
-        }
+            return group, texts, variant
 
-    def _generate_with_fallback(self, prompt: str, temperature: float):
-        """Try the configured model; if 404, retry with a '-latest' variant."""
+        tasks = [
+            asyncio.ensure_future(run_group(group))
+            for group in itertools.batched(
+                (indices[0] for indices in pending.values()), self.marshal_batch
+            )
+        ]
+        store, record = self._store_texts, _summary_record
         try:
-            return self.client.models.generate_content(
-                model=self.model,
-                contents=prompt,
-                config={"temperature": temperature},
+            for next_done in asyncio.as_completed(tasks):
+                group, texts, variant = await next_done
+                store(
+                    [(prompts[i], t) for i, t in zip(group, texts)],
+                    temperature,
+                    variant=variant,
+                )
+                for first, text in zip(group, texts):
+                    for index in pending[prompts[first]]:
+                        yield index, record(scraped_patterns[index], text)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def generate_hints_async(self, pattern_names: Sequence[str]) -> str:
+        """Ask for a few study tips tailored to the patterns; "" on any failure."""
+        try:
+            await self._aensure_model()
+            response = await self._agenerate(
+                build_hints_prompt(pattern_names), HINTS_TEMPERATURE
             )
-        except ClientError as err:
-            status = (
-                getattr(err, "status_code", None)
-                or getattr(err, "code", None)
-                or getattr(err, "http_status", None)
+        except Exception:
+            return ""
+        return getattr(response, "text", "") or ""
+
+    async def _summarize_group_async(
+        self,
+        group: Sequence[Mapping[str, Any]],
+        prompts: Sequence[str],
+        *,
+        temperature: float,
+        semaphore: asyncio.Semaphore,
+    ) -> Tuple[List[str], str]:
+        """Summarize several patterns with one request (a JSON array reply).
+
+        Also returns the PromptCache variant the summaries should be stored under.
+        """
+        if len(group) == 1:
+            return [await self._summarize_single_async(prompts[0], temperature, semaphore)], ""
+        async with semaphore:
+            response = await self._agenerate(
+                build_batch_prompt(group), temperature, json_output=True
             )
-            message = str(err)
-            if status == 404 or "NOT_FOUND" in message:
-                alt_model = (
-                    f"{self.model}-latest"
-                    if not str(self.model).endswith("-latest")
-                    else DEFAULT_MODEL
+        text = getattr(response, "text", "") or ""
+        summaries = _parse_summary_array(text, len(group))
+        if summaries is None:
+            # Malformed or short reply; fall back to one request per pattern.
+            singles = await asyncio.gather(
+                *(
+                    self._summarize_single_async(prompt, temperature, semaphore)
+                    for prompt in prompts
                 )
-                return self.client.models.generate_content(
-                    model=alt_model,
+            )
+            return list(singles), ""
+        return summaries, MARSHALED_CACHE_VARIANT
+
+    async def _summarize_single_async(
+        self, prompt: str, temperature: float, semaphore: asyncio.Semaphore
+    ) -> str:
+        async with semaphore:
+            response = await self._agenerate(prompt, temperature)
+        return getattr(response, "text", "") or ""
+
+    def _cached_texts(
+        self,
+        prompts: Sequence[str],
+        temperature: float,
+        variants: Sequence[str] = ("",),
+    ) -> List[str | None]:
+        """Cached text per prompt, trying each PromptCache variant in order."""
+        if self.cache is None:
+            return [None] * len(prompts)
+        get, model = self.cache.get, self.model
+        texts: List[str | None] = []
+        for prompt in prompts:
+            text = None
+            for variant in variants:
+                text = get(model, temperature, prompt, variant=variant)
+                if text is not None:
+                    break
+            texts.append(text)
+        return texts
+
+    def _store_texts(
+        self, items: Sequence[Tuple[str, str]], temperature: float, *, variant: str = ""
+    ) -> None:
+        """Cache non-empty responses; placeholders are never persisted."""
+        if self.cache is not None:
+            self.cache.set_many(
+                self.model,
+                temperature,
+                [(p, t) for p, t in items if t and t.strip()],
+                variant=variant,
+            )
+
+    def summarize_patterns_batch(
+        self,
+        scraped_patterns: Sequence[Mapping[str, Any]],
+        *,
+        temperature: float = DEFAULT_TEMPERATURE,
+        timeout: float | None = None,
+    ) -> List[Dict[str, str]]:
+        """Summarize patterns through one Gemini Batch API job.
+
+        Same output as summarize_patterns, at about half the token price, but
+        the job may take minutes to hours; blocks until it finishes or
+        `timeout` seconds pass (TimeoutError). A job that ends without results
+        raises BatchUnavailable. Failed entries get the placeholder summary.
+        """
+        self._ensure_model()
+        prompts = [_pattern_prompt(pattern) for pattern in scraped_patterns]
+        texts = self._cached_texts(prompts, temperature)
+        pending = _pending_by_prompt(prompts, texts)
+        lines = [
+            _dumps(
+                {
+                    "key": str(indices[0]),
+                    "request": {
+                        "contents": [{"role": "user", "parts": [{"text": prompt}]}],
+                        "generation_config": {"temperature": temperature},
+                    },
+                }
+            )
+            for prompt, indices in pending.items()
+        ]
+        if lines:
+            uploaded = self.client.files.upload(
+                file=io.BytesIO(b"\n".join(lines)),
+                config={"mime_type": "jsonl", "display_name": BATCH_DISPLAY_NAME},
+            )
+            job = self.client.batches.create(
+                model=self.model,
+                src=uploaded.name,
+                config={"display_name": BATCH_DISPLAY_NAME},
+            )
+            job = self._wait_for_batch(job.name, timeout=timeout)
+            results = _parse_batch_results(
+                self.client.files.download(file=job.dest.file_name)
+            )
+            fresh = []
+            for prompt, indices in pending.items():
+                text = results.get(str(indices[0]), "")
+                for index in indices:
+                    texts[index] = text
+                fresh.append((prompt, text))
+            self._store_texts(fresh, temperature)
+        return [
+            _summary_record(pattern, text)
+            for pattern, text in zip(scraped_patterns, texts)
+        ]
+
+    def _wait_for_batch(self, name: str, *, timeout: float | None):
+        """Poll a batch job with capped exponential backoff until it finishes."""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        delay = BATCH_POLL_SECONDS
+        while True:
+            job = self.client.batches.get(name=name)
+            state = job.state.name if job.state else ""
+            if state == "JOB_STATE_SUCCEEDED":
+                return job
+            if state in _BATCH_FAILED_STATES:
+                raise BatchUnavailable(f"Gemini batch job {name} ended in {state}: {job.error}")
+            if deadline is not None and time.monotonic() + delay > deadline:
+                try:  # nobody will collect the results; stop paying for them
+                    self.client.batches.cancel(name=name)
+                except Exception:
+                    pass
+                raise TimeoutError(f"Gemini batch job {name} still {state} after {timeout}s")
+            time.sleep(delay)
+            delay = min(delay * 2, BATCH_MAX_POLL_SECONDS)
+
+    def _ensure_model(self) -> None:
+        """Probe the configured model once per process; switch to the fallback on 404.
+
+        Replaces a failed round-trip per request with one models.get call.
+        Blocking; async code uses _aensure_model.
+        """
+        if self.model in _VALIDATED_MODELS:
+            self.model = _VALIDATED_MODELS[self.model]
+            return
+        try:
+            self.client.models.get(model=self.model)
+        except Exception as err:
+            self._record_probe(err)
+        else:
+            self._record_probe(None)
+
+    async def _aensure_model(self) -> None:
+        """_ensure_model without blocking the event loop."""
+        if self.model in _VALIDATED_MODELS:
+            self.model = _VALIDATED_MODELS[self.model]
+            return
+        try:
+            await self._async_client().models.get(model=self.model)
+        except Exception as err:
+            self._record_probe(err)
+        else:
+            self._record_probe(None)
+
+    def _record_probe(self, err: Exception | None) -> None:
+        if err is None:
+            resolved = self.model
+        elif isinstance(err, ClientError) and _is_not_found(err):
+            resolved = self._fallback_model()
+        else:
+            # Not a verdict on the name: leave it unresolved so the probe runs
+            # again next time and _agenerate still falls back on a 404.
+            return
+        _VALIDATED_MODELS[self.model] = resolved
+        _VALIDATED_MODELS.setdefault(resolved, resolved)
+        self.model = resolved
+
+    async def _agenerate(
+        self, prompt: str, temperature: float, *, json_output: bool = False
+    ):
+        """One async generate_content call; json_output asks for a JSON reply.
+
+        Quota errors are retried after the delay the API asks for; callers hold
+        their semaphore slot while waiting, which throttles the whole run.
+        """
+        config: Dict[str, Any] = {"temperature": temperature}
+        if json_output:
+            config["response_mime_type"] = "application/json"
+        attempt = 0
+        while True:
+            model = self.model
+            try:
+                return await self._async_client().models.generate_content(
+                    model=model,
                     contents=prompt,
-                    config={"temperature": temperature},
+                    config=config,
                 )
-            raise
+            except ClientError as err:
+                if _is_not_found(err):
+                    if model not in _VALIDATED_MODELS:
+                        # The probe was inconclusive; fall back here instead.
+                        self._record_probe(err)
+                    resolved = _VALIDATED_MODELS.get(model, model)
+                    if resolved != model:
+                        self.model = resolved
+                        continue
+                delay = _quota_retry_delay(err)
+                if delay is None or attempt == QUOTA_RETRY_ATTEMPTS:
+                    raise
+                attempt += 1
+                await asyncio.sleep(delay + random.uniform(0, 1))
+
+    def _fallback_model(self) -> str:
+        return (
+            f"{self.model}-latest"
+            if not str(self.model).endswith("-latest")
+            else DEFAULT_MODEL
+        )
+
+
+def _http_options(**kwargs: Any) -> types.HttpOptions:
+    return types.HttpOptions(
+        retry_options=types.HttpRetryOptions(
+            attempts=RETRY_ATTEMPTS,
+            http_status_codes=list(RETRY_STATUS_CODES),
+        ),
+        **kwargs,
+    )
+
+
+def _pattern_prompt(pattern: Mapping[str, Any]) -> str:
+    get = pattern.get
+    return build_prompt(
+        get("pattern") or "Unknown Pattern",
+        get("problems") or [],
+        get("notes") or "",
+    )
+
+
+def _pending_by_prompt(
+    prompts: Sequence[str], texts: Sequence[str | None]
+) -> Dict[str, List[int]]:
+    """Uncached prompts mapped to every index that uses them, in first-seen order."""
+    pending: Dict[str, List[int]] = {}
+    for index, (prompt, text) in enumerate(zip(prompts, texts)):
+        if text is None:
+            pending.setdefault(prompt, []).append(index)
+    return pending
+
+
+def _summary_record(pattern: Mapping[str, Any], text: str | None) -> Dict[str, str]:
+    """Shape one model response into the summarize_patterns output dict."""
+    get = pattern.get
+    pattern_name = get("pattern") or "Unknown Pattern"
+    summary_text = (text or "").strip()
+    if not summary_text:
+        summary_text = (
+            f"{pattern_name}: core idea summary unavailable; review pattern notes."
+        )
+    return {
+        "pattern": pattern_name,
+        "url": get("url") or "",
+        "summary": summary_text,
+        "top_problems": format_problems(get("problems") or []),
+    }
+
+
+def _parse_summary_array(text: str | None, expected: int) -> List[str] | None:
+    """Summaries from a marshaled reply, or None if it is not `expected` items."""
+    try:
+        data = _loads(_JSON_FENCE_RE.sub("", text or ""))
+    except ValueError:
+        return None
+    if not isinstance(data, list) or len(data) != expected:
+        return None
+    return [
+        str(item.get("summary") or "") if isinstance(item, dict) else str(item)
+        for item in data
+    ]
+
+
+def _parse_batch_results(payload: bytes) -> Dict[str, str]:
+    """Map batch result keys to response text; errored entries are skipped."""
+    texts: Dict[str, str] = {}
+    for line in payload.splitlines():
+        if not line.strip():
+            continue
+        record = _loads(line)
+        candidates = (record.get("response") or {}).get("candidates") or []
+        if not candidates:
+            continue
+        parts = (candidates[0].get("content") or {}).get("parts") or []
+        texts[str(record.get("key"))] = "".join(part.get("text", "") for part in parts)
+    return texts
+
+
+def _is_not_found(err: ClientError) -> bool:
+    status = (
+        getattr(err, "status_code", None)
+        or getattr(err, "code", None)
+        or getattr(err, "http_status", None)
+    )
+    return status == 404 or "NOT_FOUND" in str(err)
+
+
+def _quota_retry_delay(err: ClientError) -> float | None:
+    """Seconds a 429 reply asks us to wait (google.rpc.RetryInfo), capped; else None."""
+    if getattr(err, "code", None) != 429 or not isinstance(err.details, dict):
+        return None
+    for detail in (err.details.get("error") or {}).get("details") or []:
+        if isinstance(detail, dict) and "retryDelay" in detail:
+            match = _RETRY_DELAY_RE.match(str(detail["retryDelay"]))
+            if match:
+                return min(float(match.group(1)), QUOTA_MAX_DELAY_SECONDS)
+    return None
 
 
 def build_prompt(
     pattern_name: str, problems: Sequence[Mapping[str, Any]], notes: str | None
 ) -> str:
     """Create a concise instruction prompt for Gemini."""
-    problems_text = "\n".join(
-        f"- {p.get('title', 'Unknown title')} ({p.get('difficulty', 'N/A')})"
-        for p in problems[:8]
+    return _build_prompt_cached(pattern_name, _problems_key(problems), notes or "")
+
+
+@functools.lru_cache(maxsize=1024)
+def _build_prompt_cached(
+    pattern_name: str, problems: Tuple[Tuple[str, str], ...], notes: str
+) -> str:
+    return _PROMPT_TEMPLATE.format(block=_pattern_block(pattern_name, problems, notes))
+
+
+def build_batch_prompt(patterns: Sequence[Mapping[str, Any]]) -> str:
+    """Create one prompt that asks for a JSON array of summaries, in order."""
+    blocks = "\n\n".join(
+        f"{index}. "
+        + _pattern_block(
+            p.get("pattern") or "Unknown Pattern",
+            _problems_key(p.get("problems") or []),
+            p.get("notes") or "",
+        )
+        for index, p in enumerate(patterns, 1)
     )
     return (
-        f"You are summarizing a LeetCode pattern for a study sheet.\n"
-        f"Pattern: {pattern_name}\n"
-        f"Context: {notes or 'No extra notes provided.'}\n"
-        f"Representative problems:\n{problems_text or '- No problems listed.'}\n\n"
-        "Write a crisp 1-2 sentence description that explains the core idea, when to use it, "
-        "and the intuition a learner should remember. Avoid verbosity and avoid code. "
-        "Keep it under 420 characters."
+        f"You are summarizing {len(patterns)} LeetCode patterns for a study sheet.\n\n"
+        f"{blocks}\n\n"
+        "For each pattern, write a crisp 1-2 sentence description that explains the core idea, "
+        "when to use it, and the intuition a learner should remember. Avoid verbosity and avoid "
+        "code. Keep each under 420 characters.\n"
+        f'Return only a JSON array of {len(patterns)} objects {{"pattern": ..., "summary": ...}}, '
+        "in the same order as above."
+    )
+
+
+def _problems_key(problems: Sequence[Mapping[str, Any]]) -> Tuple[Tuple[str, str], ...]:
+    """Hashable (title, difficulty) view of the problems a prompt lists."""
+    return tuple(
+        (str(p.get("title", "Unknown title")), str(p.get("difficulty", "N/A")))
+        for p in itertools.islice(problems, 8)
+    )
+
+
+def _pattern_block(
+    pattern_name: str, problems: Tuple[Tuple[str, str], ...], notes: str | None
+) -> str:
+    problems_text = "\n".join(f"- {title} ({difficulty})" for title, difficulty in problems)
+    return _PATTERN_BLOCK_TEMPLATE.format(
+        pattern_name=pattern_name,
+        notes=notes or "No extra notes provided.",
+        problems=problems_text or "- No problems listed.",
+    )
+
+
+def build_hints_prompt(pattern_names: Sequence[str]) -> str:
+    """Create the prompt for 5 short study tips covering the first 12 patterns."""
+    return (
+        "Give 5 concise LeetCode study tips tailored to these patterns: "
+        f"{', '.join(pattern_names[:12])}. Keep each tip under 90 chars, no numbering."
     )
 
 
 def format_problems(problems: Sequence[Mapping[str, Any]]) -> str:
     """Render up to 3 representative problems as a short bullet list string."""
-    formatted = []
-    for p in problems[:3]:
-        title = p.get("title", "Unknown title")
-        difficulty = p.get("difficulty", "N/A")
-        url = p.get("url") or ""
-        formatted.append(f"- {title} ({difficulty}) {url}".strip())
-    return "\n".join(formatted) if formatted else "-"
+    return (
+        "\n".join(
+            f"- {p.get('title', 'Unknown title')} ({p.get('difficulty', 'N/A')}) "
+            f"{p.get('url') or ''}".rstrip()
+            for p in itertools.islice(problems, 3)
+        )
+        or "-"
+    )
 
 
-__all__ = ["GeminiSummarizer", "build_prompt", "format_problems"]
+__all__ = [
+    "BatchUnavailable",
+    "GeminiSummarizer",
+    "build_prompt",
+    "build_batch_prompt",
+    "build_hints_prompt",
+    "format_problems",
+]
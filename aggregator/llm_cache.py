@@ -0,0 +1,113 @@
+"""On-disk cache of Gemini responses keyed by a hash of the prompt.
+
+Re-running the CLI over unchanged patterns builds identical prompts, so their
+summaries can be served from disk instead of paying for another model call.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import time
+from typing import Iterable, Tuple
+
+# Shares the scrape cache directory; override via LCP_CACHE_DIR.
+CACHE_DIR_ENV = "LCP_CACHE_DIR"
+CACHE_FILE_NAME = "llm_responses.sqlite3"
+DEFAULT_TTL_DAYS = 30.0
+
+
+def default_cache_path() -> str:
+    cache_dir = os.getenv(CACHE_DIR_ENV) or os.path.join(
+        os.path.expanduser("~"), ".cache", "leetcode_patterns"
+    )
+    return os.path.join(cache_dir, CACHE_FILE_NAME)
+
+
+class PromptCache:
+    """SQLite-backed prompt -> response cache; failures disable it, never raise."""
+
+    def __init__(self, path: str | None = None, *, ttl_days: float | None = DEFAULT_TTL_DAYS):
+        self.path = path or default_cache_path()
+        self.ttl_seconds = ttl_days * 24 * 60 * 60 if ttl_days else None
+        self._conn: sqlite3.Connection | None = None
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            # Calls never overlap, but the batch path runs in a worker thread.
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key BLOB PRIMARY KEY, model TEXT, temperature REAL, "
+                "response TEXT, created_at INTEGER)"
+            )
+            conn.commit()
+            self._conn = conn
+        except (OSError, sqlite3.Error):
+            self._conn = None
+
+    @staticmethod
+    def key(model: str, temperature: float, prompt: str, variant: str = "") -> bytes:
+        # variant tags responses to the same prompt that came from a different
+        # request shape (e.g. several prompts answered in one reply).
+        return hashlib.blake2b(
+            f"{model}|{temperature}|{variant}|{prompt}".encode("utf-8"), digest_size=16
+        ).digest()
+
+    def get(
+        self, model: str, temperature: float, prompt: str, *, variant: str = ""
+    ) -> str | None:
+        """Cached response for the prompt, or None if missing or expired."""
+        if self._conn is None:
+            return None
+        try:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?",
+                (self.key(model, temperature, prompt, variant),),
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        response, created_at = row
+        if self.ttl_seconds is not None and created_at < time.time() - self.ttl_seconds:
+            return None
+        return response
+
+    def set_many(
+        self,
+        model: str,
+        temperature: float,
+        items: Iterable[Tuple[str, str]],
+        *,
+        variant: str = "",
+    ) -> None:
+        """Store (prompt, response) pairs in a single transaction."""
+        if self._conn is None:
+            return
+        now = int(time.time())
+        rows = [
+            (self.key(model, temperature, prompt, variant), model, temperature, response, now)
+            for prompt, response in items
+        ]
+        if not rows:
+            return
+        try:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO responses "
+                    "(key, model, temperature, response, created_at) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+        except sqlite3.Error:
+            pass
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+__all__ = ["PromptCache", "default_cache_path"]
@@ -3,53 +3,180 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
+import contextlib
 import os
-from typing import Dict, List
+import re
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
 
-from aggregator.aggregator import scrape_patterns
-from aggregator.gemini import GeminiSummarizer
-from sheet.sheet_populator import push_pattern_sheets
+from aggregator.llm_cache import DEFAULT_TTL_DAYS, PromptCache
+
+if TYPE_CHECKING:
+    from aggregator.gemini import GeminiSummarizer
+
+# KEY=value lines; blank lines, comments and lines without '=' never match.
+_ENV_LINE_RE = re.compile(r"^[^\S\n]*([^#\s=][^=\n]*?)[^\S\n]*=[^\S\n]*(.*?)[^\S\n]*$", re.MULTILINE)
+
+# Above this many patterns, summaries go through the (cheaper, slower) Batch API.
+BATCH_THRESHOLD = 20
+# Longest wait for a Batch API job before falling back to regular requests.
+DEFAULT_BATCH_TIMEOUT_SECONDS = 30 * 60.0
+# Pattern tabs are uploaded in order, this many at a time, while later summaries run.
+UPLOAD_CHUNK = 10
+UPLOAD_QUEUE_SIZE = 32
 
 
 def load_env_file(env_path: str = ".env") -> Dict[str, str]:
     """Lightweight .env loader; populates os.environ if keys are absent."""
-    loaded: Dict[str, str] = {}
     if not os.path.exists(env_path):
-        return loaded
+        return {}
     with open(env_path, "r", encoding="utf-8") as f:
-        for line in f:
-            stripped = line.strip()
-            if not stripped or stripped.startswith("#") or "=" not in stripped:
-                continue
-            key, value = stripped.split("=", 1)
-            key = key.strip()
-            value = value.strip().strip('"').strip("'")
-            loaded[key] = value
-            if key not in os.environ:
-                os.environ[key] = value
+        content = f.read()
+    loaded: Dict[str, str] = {}
+    missing: Dict[str, str] = {}
+    for key, value in _ENV_LINE_RE.findall(content):
+        value = value.strip('"').strip("'")
+        loaded[key] = value
+        if key not in os.environ:
+            missing.setdefault(key, value)  # first definition wins, as before
+    os.environ.update(missing)
     return loaded
 
 
-def run(spreadsheet_id: str, *, base_url: str | None = None) -> None:
-    patterns = scrape_patterns(base_url=base_url)
+def run(
+    spreadsheet_id: str,
+    *,
+    base_url: str | None = None,
+    refresh: bool = False,
+    use_batch: bool | None = None,
+    batch_timeout: float | None = DEFAULT_BATCH_TIMEOUT_SECONDS,
+    use_cache: bool = True,
+    cache_ttl_days: float | None = DEFAULT_TTL_DAYS,
+) -> None:
+    # Heavy imports (google-genai, googleapiclient) are deferred so that
+    # `--help` and argument errors return without loading them.
+    from aggregator.aggregator import scrape_patterns
+    from aggregator.gemini import GeminiSummarizer
+
+    patterns = scrape_patterns(base_url=base_url, force_refresh=refresh)
     if not patterns:
         raise RuntimeError(
             "No patterns were scraped; check base_url, network access, or provide FALLBACK_PATTERNS_FILE."
         )
-    summarizer = GeminiSummarizer()
-    summarized = summarizer.summarize_patterns(patterns)
+    cache = PromptCache(ttl_days=cache_ttl_days) if use_cache else None
+    summarizer = GeminiSummarizer(cache=cache)
+    if use_batch is None:
+        use_batch = len(patterns) > BATCH_THRESHOLD
+    try:
+        asyncio.run(
+            summarize_and_push(
+                summarizer,
+                patterns,
+                spreadsheet_id,
+                use_batch=use_batch,
+                batch_timeout=batch_timeout,
+            )
+        )
+    finally:
+        if cache is not None:
+            cache.close()
+
 
-    # Merge summaries back onto original pattern objects.
-    enriched = []
-    for original, summary in zip(patterns, summarized):
-        merged = dict(original)
-        merged.update(summary)
-        enriched.append(merged)
+async def summarize_and_push(
+    summarizer: GeminiSummarizer,
+    patterns: List[Dict[str, Any]],
+    spreadsheet_id: str,
+    *,
+    use_batch: bool,
+    batch_timeout: float | None = DEFAULT_BATCH_TIMEOUT_SECONDS,
+) -> None:
+    """Summarize patterns and upload their tabs, overlapping the two phases.
 
-    resources_rows = build_resources_rows(summarizer, enriched)
+    Summaries flow through a bounded queue to an uploader that writes tabs in
+    pattern order, UPLOAD_CHUNK at a time; the Resources tab goes last, once
+    the study-tips request (run alongside the summaries) has finished.
+    """
+    from sheet.sheet_populator import push_pattern_sheets
+
+    pattern_names = [p.get("pattern", "") for p in patterns]
+    queue: asyncio.Queue[Tuple[int, Dict[str, str]] | None] = asyncio.Queue(
+        maxsize=UPLOAD_QUEUE_SIZE
+    )
+
+    async def produce() -> None:
+        from aggregator.gemini import BatchUnavailable
+
+        summarized = None
+        if use_batch:
+            # The Batch API client blocks while polling; keep it off the event loop.
+            try:
+                summarized = await asyncio.to_thread(
+                    summarizer.summarize_patterns_batch, patterns, timeout=batch_timeout
+                )
+            except (TimeoutError, BatchUnavailable):
+                pass  # no batch results; summarize with regular requests instead
+        if summarized is not None:
+            for item in enumerate(summarized):
+                await queue.put(item)
+        else:
+            async with contextlib.aclosing(summarizer.iter_summaries_async(patterns)) as items:
+                async for item in items:
+                    await queue.put(item)
+        await queue.put(None)
+
+    # A failure in any task cancels the others; otherwise a failed uploader
+    # would leave the producer blocked on a full queue.
+    try:
+        async with asyncio.TaskGroup() as group:
+            hints_task = group.create_task(summarizer.generate_hints_async(pattern_names))
+            group.create_task(produce())
+            group.create_task(_upload_in_order(queue, patterns, spreadsheet_id))
+    except BaseExceptionGroup as errors:
+        if len(errors.exceptions) > 1:
+            raise  # several tasks failed; keep every error
+        raise errors.exceptions[0] from None
+    finally:
+        await summarizer.aclose()
+    hints_text = hints_task.result()
+
+    await asyncio.to_thread(
+        push_pattern_sheets,
+        spreadsheet_id,
+        [],
+        clear_first=True,
+        resources_rows=build_resources_rows(hints_text),
+    )
 
-    # Create one tab per pattern with solved columns + resources tab.
-    push_pattern_sheets(spreadsheet_id, enriched, clear_first=True, resources_rows=resources_rows)
+
+async def _upload_in_order(
+    queue: asyncio.Queue[Tuple[int, Dict[str, str]] | None],
+    patterns: List[Dict[str, Any]],
+    spreadsheet_id: str,
+) -> None:
+    """Merge summaries into patterns and push contiguous runs of finished tabs."""
+    from sheet.sheet_populator import push_pattern_sheets
+
+    finished = set()
+    next_index = 0
+    while True:
+        item = await queue.get()
+        if item is not None:
+            index, summary = item
+            # Merge in place; the scraped dicts are not reused elsewhere.
+            patterns[index].update(summary)
+            finished.add(index)
+        end = next_index
+        while end in finished:
+            end += 1
+        if end - next_index >= UPLOAD_CHUNK or (item is None and end > next_index):
+            await asyncio.to_thread(
+                push_pattern_sheets, spreadsheet_id, patterns[next_index:end], clear_first=True
+            )
+            next_index = end
+        if item is None:
+            break
+    if next_index != len(patterns):
+        raise RuntimeError(f"Only {next_index} of {len(patterns)} patterns were summarized.")
 
 
 def parse_args() -> argparse.Namespace:
@@ -68,16 +195,63 @@ def parse_args() -> argparse.Namespace:
         default=os.getenv("BASE_SITE"),
         help="Override base site URL. Defaults to BASE_SITE from environment/.env.",
     )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore the on-disk scrape cache and fetch patterns from the network.",
+    )
+    parser.add_argument(
+        "--batch",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help=(
+            "Summarize through the Gemini Batch API (about half the cost, slower). "
+            f"Defaults to on when more than {BATCH_THRESHOLD} patterns are scraped."
+        ),
+    )
+    parser.add_argument(
+        "--batch-timeout",
+        type=float,
+        default=DEFAULT_BATCH_TIMEOUT_SECONDS,
+        metavar="SECONDS",
+        help=(
+            "Give up on a Batch API job after this long and summarize with regular "
+            f"requests instead (default: {DEFAULT_BATCH_TIMEOUT_SECONDS:g})."
+        ),
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="use_cache",
+        action="store_false",
+        help="Always call Gemini instead of reusing cached summaries for unchanged prompts.",
+    )
+    parser.add_argument(
+        "--cache-ttl-days",
+        type=float,
+        default=DEFAULT_TTL_DAYS,
+        help=f"Age after which cached summaries are regenerated (default: {DEFAULT_TTL_DAYS:g}).",
+    )
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
-    run(args.spreadsheet_id, base_url=args.base_url)
+    run(
+        args.spreadsheet_id,
+        base_url=args.base_url,
+        refresh=args.refresh,
+        use_batch=args.batch,
+        use_cache=args.use_cache,
+        cache_ttl_days=args.cache_ttl_days,
+        batch_timeout=args.batch_timeout,
+    )
+
 
+def build_resources_rows(hints_text: str = "") -> List[List[str]]:
+    """Build a resources sheet with curated links and Gemini-generated hints.
 
-def build_resources_rows(summarizer: GeminiSummarizer, patterns: List[Dict]) -> List[List[str]]:
-    """Build a resources sheet with curated links and Gemini-generated hints."""
+    hints_text is the raw model reply with extra tips, one per line.
+    """
     resources = [
         {
             "name": "LeetCode Patterns (Sean Prashad)",
@@ -123,21 +297,11 @@ def build_resources_rows(summarizer: GeminiSummarizer, patterns: List[Dict]) ->
         "Prefix sums/diffs: convert range updates/queries to O(1).",
     ]
 
-    # Try to get Gemini to add 5 more concise study tips tailored to current patterns.
-    try:
-        pattern_names = ", ".join(p.get("pattern", "") for p in patterns[:12])
-        prompt = (
-            "Give 5 concise LeetCode study tips tailored to these patterns: "
-            f"{pattern_names}. Keep each tip under 90 chars, no numbering."
-        )
-        resp = summarizer._generate_with_fallback(prompt, temperature=0.2)  # type: ignore[attr-defined]
-        text = resp.text if hasattr(resp, "text") else ""
-        for line in text.splitlines():
-            tip = line.strip("-• ").strip()
-            if tip:
-                hints.append(tip)
-    except Exception:
-        pass
+    # Gemini's tips tailored to the current patterns (requested alongside summaries).
+    for line in hints_text.splitlines():
+        tip = line.strip("-• ").strip()
+        if tip:
+            hints.append(tip)
 
     rows: List[List[str]] = []
     rows.append(["Resources", "Type", "Link", "Notes"])
@@ -7,19 +7,64 @@ Entrypoints:
 
 from __future__ import annotations
 
+import itertools
+import json
 import os
-from typing import Iterable, List, Mapping, Sequence
+import zlib
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Sequence, Tuple
 
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.model import JsonModel
+
+try:  # orjson is optional; it speeds up the large fused batchUpdate bodies.
+    import orjson
+except ImportError:
+    orjson = None
 
 # Full read/write scope to allow appending/replacing rows.
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
 DEFAULT_HEADERS = ["Pattern", "URL", "Summary", "Top Problems"]
 PROBLEM_HEADERS = ["Problem", "Difficulty", "URL", "Solved (Me)", "Solved (Friend)"]
+# Retries for 429/5xx responses; googleapiclient backs off exponentially with jitter.
+API_RETRIES = 5
+# push_rows sends at most this many rows per request, building them as it goes.
+ROW_CHUNK = 5000
+# Grid of a tab created by addSheet unless gridProperties says otherwise.
+DEFAULT_GRID_ROWS = 1000
+DEFAULT_GRID_COLUMNS = 26
+# Keys every summary record / normalized problem carries; see _record_row / _problem_row.
+_RECORD_FIELDS = ("pattern", "url", "summary", "top_problems")
+_PROBLEM_FIELDS = ("title", "difficulty", "url")
+_record_values = itemgetter(*_RECORD_FIELDS)
+_problem_values = itemgetter(*_PROBLEM_FIELDS)
+# Difficulty cell colors; the rule bodies are built once and shared (read-only)
+# by every addConditionalFormatRule request.
+_DIFFICULTY_COLORS = {
+    "Easy": {"red": 0.82, "green": 0.94, "blue": 0.82},
+    "Medium": {"red": 0.98, "green": 0.93, "blue": 0.82},
+    "Hard": {"red": 0.98, "green": 0.82, "blue": 0.82},
+}
+_DIFFICULTY_BOOLEAN_RULES = tuple(
+    {
+        "condition": {"type": "TEXT_EQ", "values": [{"userEnteredValue": label}]},
+        "format": {"backgroundColor": color},
+    }
+    for label, color in _DIFFICULTY_COLORS.items()
+)
+# Characters Sheets does not allow in tab titles, dropped by sanitize_title.
+_TITLE_BANNED_TABLE = str.maketrans("", "", "/\\?*[]")
+
+# (token_path, credentials_path) -> (credentials, Sheets service) for this process.
+_SERVICES: Dict[Tuple[str, str], Tuple[Credentials, Any]] = {}
+# token_path -> token JSON last read from or written to that file.
+_TOKEN_JSON: Dict[str, str] = {}
+# (token_path, credentials_path, scopes) -> credentials loaded in this process.
+_CREDS_CACHE: Dict[Tuple[str, str, Tuple[str, ...]], Credentials] = {}
 
 
 def get_credentials(
@@ -28,21 +73,94 @@ def get_credentials(
     credentials_path: str = "credentials.json",
     scopes: Sequence[str] = SCOPES,
 ) -> Credentials:
-    """Load or acquire OAuth credentials for Sheets."""
-    creds = None
+    """Load or acquire OAuth credentials for Sheets.
+
+    Credentials are kept in memory, so token.json is only read on the first
+    call per process; expired ones are refreshed in place.
+    """
+    key = (token_path, credentials_path, tuple(scopes))
+    creds = _CREDS_CACHE.get(key)
+    if creds is not None:
+        if creds.valid:
+            return creds
+        if creds.expired and creds.refresh_token:
+            try:
+                creds.refresh(Request())
+            except Exception:
+                del _CREDS_CACHE[key]
+                raise
+            _write_token(token_path, creds.to_json())
+            return creds
+        del _CREDS_CACHE[key]
+        creds = None
+
     if os.path.exists(token_path):
-        creds = Credentials.from_authorized_user_file(token_path, scopes)
+        with open(token_path, "r", encoding="utf-8") as token:
+            token_json = _TOKEN_JSON[token_path] = token.read()
+        creds = Credentials.from_authorized_user_info(json.loads(token_json), scopes)
     if not creds or not creds.valid:
         if creds and creds.expired and creds.refresh_token:
             creds.refresh(Request())
         else:
             flow = InstalledAppFlow.from_client_secrets_file(credentials_path, scopes)
             creds = flow.run_local_server(port=0)
-        with open(token_path, "w", encoding="utf-8") as token:
-            token.write(creds.to_json())
+        _write_token(token_path, creds.to_json())
+    _CREDS_CACHE[key] = creds
     return creds
 
 
+def _write_token(token_path: str, token_json: str) -> None:
+    """Atomically replace token_path with token_json, unless it already holds it."""
+    if _TOKEN_JSON.get(token_path) == token_json:
+        return
+    tmp_path = f"{token_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as token:
+        token.write(token_json)
+    # A crash mid-write leaves the old token intact rather than a truncated one.
+    os.replace(tmp_path, token_path)
+    _TOKEN_JSON[token_path] = token_json
+
+
+def _sheets_service(*, token_path: str, credentials_path: str):
+    """Sheets v4 client, built once per token file and reused while its credentials are valid."""
+    key = (token_path, credentials_path)
+    cached = _SERVICES.get(key)
+    if cached is not None and cached[0].valid:
+        return cached[1]
+    creds = get_credentials(token_path=token_path, credentials_path=credentials_path)
+    if cached is not None and cached[0] is creds:
+        return cached[1]  # same credentials, refreshed in place
+    # The discovery document bundled with the client avoids a fetch per build.
+    service = build(
+        "sheets",
+        "v4",
+        credentials=creds,
+        cache_discovery=False,
+        static_discovery=True,
+        model=_OrjsonModel() if orjson is not None else None,
+    )
+    _SERVICES[key] = (creds, service)
+    return service
+
+
+class _OrjsonModel(JsonModel):
+    """JsonModel that encodes request and decodes response bodies with orjson."""
+
+    def serialize(self, body_value):
+        if isinstance(body_value, dict) and "data" not in body_value and self._data_wrapper:
+            body_value = {"data": body_value}
+        return orjson.dumps(body_value)
+
+    def deserialize(self, content):
+        try:
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return super().deserialize(content)
+        if self._data_wrapper and isinstance(body, dict) and "data" in body:
+            body = body["data"]
+        return body
+
+
 def build_sheet_rows(
     records: Iterable[Mapping[str, str]],
     *,
@@ -50,23 +168,50 @@ def build_sheet_rows(
     headers: Sequence[str] = DEFAULT_HEADERS,
 ) -> List[List[str]]:
     """Turn record dicts into row lists for the Sheets API."""
-    rows: List[List[str]] = []
+    return list(_iter_sheet_rows(records, include_header=include_header, headers=headers))
+
+
+def _iter_sheet_rows(
+    records: Iterable[Mapping[str, str]],
+    *,
+    include_header: bool = True,
+    headers: Sequence[str] = DEFAULT_HEADERS,
+) -> Iterator[List[str]]:
     if include_header:
-        rows.append(list(headers))
-    for rec in records:
-        rows.append(
-            [
-                rec.get("pattern", ""),
-                rec.get("url", ""),
-                rec.get("summary", ""),
-                rec.get("top_problems", ""),
-            ]
-        )
-    return rows
+        yield list(headers)
+    yield from map(_record_row, records)
+
+
+def _first_row_range(range_name: str) -> str:
+    """Row 1 of range_name's sheet, e.g. "'My Tab'!A5:D" -> "'My Tab'!1:1"."""
+    sheet_name, sep, _ = range_name.rpartition("!")
+    return f"{sheet_name if sep else range_name}!1:1"
+
+
+def _record_row(rec: Mapping[str, str]) -> List[str]:
+    try:
+        return list(_record_values(rec))
+    except KeyError:  # hand-built records may leave fields out
+        return [rec.get(key, "") for key in _RECORD_FIELDS]
+
+
+def _problem_row(problem: Mapping[str, str]) -> List[str]:
+    try:
+        title, difficulty, url = _problem_values(problem)
+    except KeyError:
+        title, difficulty, url = (problem.get(key, "") for key in _PROBLEM_FIELDS)
+    return [title, difficulty, url, "", ""]  # Solved (Me), Solved (Friend) left blank
 
 
 def build_pattern_sheet_rows(record: Mapping[str, str], problems: Sequence[Mapping[str, str]]) -> List[List[str]]:
     """Build rows for a single pattern tab: summary + problem list with solved columns."""
+    return _pattern_sheet_rows(record, problems)[0]
+
+
+def _pattern_sheet_rows(
+    record: Mapping[str, str], problems: Sequence[Mapping[str, str]]
+) -> Tuple[List[List[str]], int]:
+    """build_pattern_sheet_rows plus the index of the PROBLEM_HEADERS row."""
     rows: List[List[str]] = [
         ["Pattern", record.get("pattern", "")],
         ["URL", record.get("url", "")],
@@ -76,18 +221,10 @@ def build_pattern_sheet_rows(record: Mapping[str, str], problems: Sequence[Mappi
         rows.append(["Notes", record["notes"]])
     rows.append([])  # spacer
     rows.append(["Problems", "", "", "", ""])
+    header_row_index = len(rows)
     rows.append(list(PROBLEM_HEADERS))
-    for p in problems:
-        rows.append(
-            [
-                p.get("title", ""),
-                p.get("difficulty", ""),
-                p.get("url", ""),
-                "",  # Solved (Me)
-                "",  # Solved (Friend)
-            ]
-        )
-    return rows
+    rows.extend(map(_problem_row, problems))
+    return rows, header_row_index
 
 
 def push_rows(
@@ -99,21 +236,38 @@ def push_rows(
     credentials_path: str = "credentials.json",
     clear_first: bool = False,
 ) -> None:
-    """Append or replace rows in a Google Sheet."""
-    creds = get_credentials(token_path=token_path, credentials_path=credentials_path)
-    service = build("sheets", "v4", credentials=creds)
-    rows = build_sheet_rows(records, include_header=True)
+    """Append rows after the table at range_name, or replace it when clear_first is set."""
+    service = _sheets_service(token_path=token_path, credentials_path=credentials_path)
 
     try:
         sheet = service.spreadsheets()
+        # Appends go under the existing header; a replace or an empty sheet gets one.
+        include_header = clear_first or not sheet.values().get(
+            spreadsheetId=spreadsheet_id, range=_first_row_range(range_name)
+        ).execute(num_retries=API_RETRIES).get("values")
+        # Rows are built and sent ROW_CHUNK at a time, so the full list never exists.
+        rows = _iter_sheet_rows(records, include_header=include_header)
+        chunks = itertools.batched(rows, ROW_CHUNK)
         if clear_first:
-            sheet.values().clear(spreadsheetId=spreadsheet_id, range=range_name).execute()
-        sheet.values().update(
-            spreadsheetId=spreadsheet_id,
-            range=range_name,
-            valueInputOption="RAW",
-            body={"values": rows},
-        ).execute()
+            sheet.values().clear(spreadsheetId=spreadsheet_id, range=range_name).execute(
+                num_retries=API_RETRIES
+            )
+            sheet.values().update(
+                spreadsheetId=spreadsheet_id,
+                range=range_name,
+                valueInputOption="RAW",
+                body={"values": list(next(chunks))},  # the header row is always there
+            ).execute(num_retries=API_RETRIES)
+        for chunk in chunks:
+            # The API picks the insert point after the table, so chunks (and
+            # concurrent writers) never overwrite each other's rows.
+            sheet.values().append(
+                spreadsheetId=spreadsheet_id,
+                range=range_name,
+                valueInputOption="RAW",
+                insertDataOption="OVERWRITE" if clear_first else "INSERT_ROWS",
+                body={"values": list(chunk)},
+            ).execute(num_retries=API_RETRIES)
     except HttpError as err:
         # Surface the API error for callers; logging can be added by caller.
         raise RuntimeError(f"Google Sheets API error: {err}") from err
@@ -129,54 +283,73 @@ def push_pattern_sheets(
     resources_rows: List[List[str]] | None = None,
 ) -> None:
     """Create/overwrite one sheet per pattern/topic and populate problems with solved columns."""
-    creds = get_credentials(token_path=token_path, credentials_path=credentials_path)
-    service = build("sheets", "v4", credentials=creds)
-
-    # Fetch existing sheet names once
-    meta = service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
-    existing_titles = {
-        sheet["properties"]["title"] for sheet in meta.get("sheets", []) if "properties" in sheet
+    service = _sheets_service(token_path=token_path, credentials_path=credentials_path)
+
+    # Fetch existing sheet names/ids and grid sizes once
+    properties = _sheet_properties(service, spreadsheet_id)
+    sheet_ids = {title: props["sheetId"] for title, props in properties.items()}
+    # sheetId -> (rowCount, columnCount); updateCells does not grow the grid.
+    grid_sizes = {
+        props["sheetId"]: (grid.get("rowCount", 0), grid.get("columnCount", 0))
+        for props in properties.values()
+        if (grid := props.get("gridProperties")) is not None
     }
 
+    # New tabs, values and formatting for every tab go out in one batchUpdate
+    # (one round-trip and one document revision).
+    requests_body: List[dict] = []
     for record in pattern_records:
         title = sanitize_title(record.get("pattern") or "Pattern")
         problems = record.get("problems") or []
-        rows = build_pattern_sheet_rows(record, problems)
-        range_name = f"'{title}'!A1"
-
-        if title not in existing_titles:
-            service.spreadsheets().batchUpdate(
-                spreadsheetId=spreadsheet_id,
-                body={"requests": [{"addSheet": {"properties": {"title": title}}}]},
-            ).execute()
-            existing_titles.add(title)
-
-        if clear_first:
-            service.spreadsheets().values().clear(
-                spreadsheetId=spreadsheet_id, range=range_name
-            ).execute()
-
-        service.spreadsheets().values().update(
-            spreadsheetId=spreadsheet_id,
-            range=range_name,
-            valueInputOption="RAW",
-            body={"values": rows},
-        ).execute()
-
-        apply_formatting(service, spreadsheet_id, title, rows)
+        rows, header_row_index = _pattern_sheet_rows(record, problems)
+
+        sheet_id = sheet_ids.get(title)
+        if sheet_id is None:
+            # A client-chosen id lets the requests below refer to the new tab.
+            sheet_id = sheet_ids[title] = _new_sheet_id(title, sheet_ids.values())
+            grid = grid_sizes[sheet_id] = _new_grid_size(rows)
+            requests_body.append(
+                {
+                    "addSheet": {
+                        "properties": {
+                            "title": title,
+                            "sheetId": sheet_id,
+                            "gridProperties": {"rowCount": grid[0], "columnCount": grid[1]},
+                        }
+                    }
+                }
+            )
+        elif clear_first:
+            # Clear values only; formatting is reapplied below.
+            requests_body.append(
+                {"updateCells": {"range": {"sheetId": sheet_id}, "fields": "userEnteredValue"}}
+            )
+        requests_body += _grow_grid_requests(sheet_id, rows, grid_sizes)
+        requests_body.append(_update_cells_request(sheet_id, rows))
+        requests_body += formatting_requests(sheet_id, rows, header_row_index)
+
+    if requests_body:
+        service.spreadsheets().batchUpdate(
+            spreadsheetId=spreadsheet_id, body={"requests": requests_body}
+        ).execute(num_retries=API_RETRIES)
 
     if resources_rows:
-        push_resources_sheet(service, spreadsheet_id, resources_rows)
+        push_resources_sheet(service, spreadsheet_id, resources_rows, sheet_ids=sheet_ids)
+
 
+def formatting_requests(
+    sheet_id: int, rows: List[List[str]], header_row_index: int | None
+) -> List[dict]:
+    """batchUpdate requests setting column widths and difficulty coloring for a tab.
 
-def apply_formatting(service, spreadsheet_id: str, title: str, rows: List[List[str]]) -> None:
-    """Set column widths and apply difficulty-based coloring for a sheet."""
+    header_row_index is the PROBLEM_HEADERS row; None skips header/difficulty styling.
+    """
     # Column widths: A wider for problem titles, C wider for URLs.
     requests_body = [
         {
             "updateDimensionProperties": {
                 "range": {
-                    "sheetId": _get_sheet_id(service, spreadsheet_id, title),
+                    "sheetId": sheet_id,
                     "dimension": "COLUMNS",
                     "startIndex": 0,  # A
                     "endIndex": 1,
@@ -188,7 +361,7 @@ def apply_formatting(service, spreadsheet_id: str, title: str, rows: List[List[s
         {
             "updateDimensionProperties": {
                 "range": {
-                    "sheetId": _get_sheet_id(service, spreadsheet_id, title),
+                    "sheetId": sheet_id,
                     "dimension": "COLUMNS",
                     "startIndex": 2,  # C
                     "endIndex": 3,
@@ -199,7 +372,6 @@ def apply_formatting(service, spreadsheet_id: str, title: str, rows: List[List[s
         },
     ]
 
-    header_row_index = _find_header_row_index(rows)
     if header_row_index is not None:
         data_row_start = header_row_index + 1
         # Header background.
@@ -207,7 +379,7 @@ def apply_formatting(service, spreadsheet_id: str, title: str, rows: List[List[s
             {
                 "repeatCell": {
                     "range": {
-                        "sheetId": _get_sheet_id(service, spreadsheet_id, title),
+                        "sheetId": sheet_id,
                         "startRowIndex": header_row_index,
                         "endRowIndex": header_row_index + 1,
                         "startColumnIndex": 0,
@@ -225,97 +397,170 @@ def apply_formatting(service, spreadsheet_id: str, title: str, rows: List[List[s
         )
 
         # Difficulty conditional formatting on column B.
-        sheet_id = _get_sheet_id(service, spreadsheet_id, title)
         data_row_end = data_row_start + max(1, len(rows) - data_row_start)
         requests_body += _difficulty_format_rules(sheet_id, data_row_start, data_row_end)
 
-    service.spreadsheets().batchUpdate(
-        spreadsheetId=spreadsheet_id, body={"requests": requests_body}
-    ).execute()
+    return requests_body
 
 
-def _get_sheet_id(service, spreadsheet_id: str, title: str) -> int:
-    meta = service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
-    for sheet in meta.get("sheets", []):
-        props = sheet.get("properties", {})
-        if props.get("title") == title:
-            return props.get("sheetId")
-    raise RuntimeError(f"Sheet '{title}' not found.")
+def _update_cells_request(sheet_id: int, rows: List[List[str]]) -> dict:
+    """updateCells request writing rows from A1, like values.update with RAW input."""
+    return {
+        "updateCells": {
+            "start": {"sheetId": sheet_id, "rowIndex": 0, "columnIndex": 0},
+            "rows": [{"values": [_cell_data(value) for value in row]} for row in rows],
+            "fields": "userEnteredValue",
+        }
+    }
+
+
+def _new_grid_size(rows: List[List[str]]) -> Tuple[int, int]:
+    """(rowCount, columnCount) for a new tab: the Sheets default, or larger to fit rows."""
+    width = max(map(len, rows), default=0)
+    return max(DEFAULT_GRID_ROWS, len(rows)), max(DEFAULT_GRID_COLUMNS, width)
+
+
+def _grow_grid_requests(
+    sheet_id: int, rows: List[List[str]], grid_sizes: Dict[int, Tuple[int, int]]
+) -> List[dict]:
+    """appendDimension requests so the tab's grid fits rows; values.update did this itself."""
+    if sheet_id not in grid_sizes:
+        return []
+    row_count, column_count = grid_sizes[sheet_id]
+    width = max(map(len, rows), default=0)
+    requests_body = []
+    for dimension, needed, have in (
+        ("ROWS", len(rows), row_count),
+        ("COLUMNS", width, column_count),
+    ):
+        if needed > have:
+            requests_body.append(
+                {
+                    "appendDimension": {
+                        "sheetId": sheet_id,
+                        "dimension": dimension,
+                        "length": needed - have,
+                    }
+                }
+            )
+    grid_sizes[sheet_id] = (max(row_count, len(rows)), max(column_count, width))
+    return requests_body
+
+
+def _cell_data(value: object) -> dict:
+    # Empty cells carry no value, which clears them under the userEnteredValue mask.
+    if value is None or value == "":
+        return {}
+    if isinstance(value, bool):
+        return {"userEnteredValue": {"boolValue": value}}
+    if isinstance(value, (int, float)):
+        return {"userEnteredValue": {"numberValue": value}}
+    return {"userEnteredValue": {"stringValue": str(value)}}
+
+
+def _new_sheet_id(title: str, taken: Iterable[int]) -> int:
+    """Stable non-negative 31-bit sheet id for a new tab, avoiding ids in use."""
+    taken = set(taken)
+    sheet_id = zlib.crc32(title.encode("utf-8")) & 0x7FFFFFFF
+    while sheet_id in taken:
+        sheet_id = (sheet_id + 1) & 0x7FFFFFFF
+    return sheet_id
+
+
+def _sheet_id_map(service, spreadsheet_id: str) -> Dict[str, int]:
+    """Title -> sheetId for every tab, from one metadata fetch."""
+    return {
+        title: props["sheetId"]
+        for title, props in _sheet_properties(service, spreadsheet_id).items()
+    }
 
 
-def _find_header_row_index(rows: List[List[str]]) -> int | None:
-    for idx, row in enumerate(rows):
-        if row == PROBLEM_HEADERS:
-            return idx
-    return None
+def _sheet_properties(service, spreadsheet_id: str) -> Dict[str, dict]:
+    """Title -> properties (sheetId, gridProperties) for every tab, from one metadata fetch."""
+    meta = service.spreadsheets().get(
+        spreadsheetId=spreadsheet_id,
+        fields="sheets.properties(title,sheetId,gridProperties(rowCount,columnCount))",
+    ).execute(num_retries=API_RETRIES)
+    return {
+        sheet["properties"]["title"]: sheet["properties"]
+        for sheet in meta.get("sheets", [])
+        if "properties" in sheet
+    }
+
+
+def _get_sheet_id(sheet_ids: Mapping[str, int], title: str) -> int:
+    try:
+        return sheet_ids[title]
+    except KeyError:
+        raise RuntimeError(f"Sheet '{title}' not found.") from None
 
 
 def _difficulty_format_rules(sheet_id: int, start_row: int, end_row: int) -> List[dict]:
     # Column B (index 1) contains difficulty.
-    rules = []
-    color_map = {
-        "Easy": {"red": 0.82, "green": 0.94, "blue": 0.82},
-        "Medium": {"red": 0.98, "green": 0.93, "blue": 0.82},
-        "Hard": {"red": 0.98, "green": 0.82, "blue": 0.82},
-    }
-    for label, color in color_map.items():
-        rules.append(
-            {
-                "addConditionalFormatRule": {
-                    "rule": {
-                        "ranges": [
-                            {
-                                "sheetId": sheet_id,
-                                "startRowIndex": start_row,
-                                "endRowIndex": end_row,
-                                "startColumnIndex": 1,
-                                "endColumnIndex": 2,
-                            }
-                        ],
-                        "booleanRule": {
-                            "condition": {
-                                "type": "TEXT_EQ",
-                                "values": [{"userEnteredValue": label}],
-                            },
-                            "format": {"backgroundColor": color},
-                        },
-                    },
-                    "index": 0,
-                }
+    ranges = [
+        {
+            "sheetId": sheet_id,
+            "startRowIndex": start_row,
+            "endRowIndex": end_row,
+            "startColumnIndex": 1,
+            "endColumnIndex": 2,
+        }
+    ]
+    return [
+        {
+            "addConditionalFormatRule": {
+                "rule": {"ranges": ranges, "booleanRule": boolean_rule},
+                "index": 0,
             }
-    )
-    return rules
+        }
+        for boolean_rule in _DIFFICULTY_BOOLEAN_RULES
+    ]
 
 
 def sanitize_title(title: str) -> str:
     """Sheets tab titles cannot contain / \\ ? * [ ] and must be <= 100 chars."""
-    banned = "/\\?*[]"
-    sanitized = "".join(ch for ch in str(title) if ch not in banned).strip()
+    sanitized = str(title).translate(_TITLE_BANNED_TABLE).strip()
     return sanitized[:90] or "Pattern"
 
 
-def push_resources_sheet(service, spreadsheet_id: str, rows: List[List[str]]) -> None:
-    """Create/overwrite a 'Resources' tab with curated resources and hints."""
+def push_resources_sheet(
+    service,
+    spreadsheet_id: str,
+    rows: List[List[str]],
+    *,
+    sheet_ids: Dict[str, int] | None = None,
+) -> None:
+    """Create/overwrite a 'Resources' tab with curated resources and hints.
+
+    sheet_ids is a title -> sheetId map the caller already holds; it is
+    fetched when omitted and updated if the tab has to be created.
+    """
     title = "Resources"
+    if sheet_ids is None:
+        sheet_ids = _sheet_id_map(service, spreadsheet_id)
     try:
-        sheet_id = _get_sheet_id(service, spreadsheet_id, title)
+        sheet_id = _get_sheet_id(sheet_ids, title)
     except RuntimeError:
-        service.spreadsheets().batchUpdate(
+        reply = service.spreadsheets().batchUpdate(
             spreadsheetId=spreadsheet_id,
             body={"requests": [{"addSheet": {"properties": {"title": title}}}]},
-        ).execute()
-        sheet_id = _get_sheet_id(service, spreadsheet_id, title)
+        ).execute(num_retries=API_RETRIES)
+        sheet_id = sheet_ids[title] = reply["replies"][0]["addSheet"]["properties"]["sheetId"]
+        created = True
+    else:
+        created = False
 
     range_name = f"'{title}'!A1"
-    service.spreadsheets().values().clear(
-        spreadsheetId=spreadsheet_id, range=range_name
-    ).execute()
+    if not created:  # a tab created just now has nothing to clear
+        service.spreadsheets().values().clear(
+            spreadsheetId=spreadsheet_id, range=range_name
+        ).execute(num_retries=API_RETRIES)
     service.spreadsheets().values().update(
         spreadsheetId=spreadsheet_id,
         range=range_name,
         valueInputOption="RAW",
         body={"values": rows},
-    ).execute()
+    ).execute(num_retries=API_RETRIES)
 
     # Simple formatting: widen columns and bold headers.
     requests_body = [
@@ -337,14 +582,14 @@ def push_resources_sheet(service, spreadsheet_id: str, rows: List[List[str]]) ->
     )
     hint_header_idx = tech_header_idx + 1 if tech_header_idx is not None else None
     header_rows = [0] + [idx for idx in (tech_header_idx, hint_header_idx) if idx is not None]
-    for hr in header_rows:
+    for start, end in _row_spans(header_rows):
         requests_body.append(
             {
                 "repeatCell": {
                     "range": {
                         "sheetId": sheet_id,
-                        "startRowIndex": hr,
-                        "endRowIndex": hr + 1,
+                        "startRowIndex": start,
+                        "endRowIndex": end,
                         "startColumnIndex": 0,
                         "endColumnIndex": 4,
                     },
@@ -360,7 +605,18 @@ def push_resources_sheet(service, spreadsheet_id: str, rows: List[List[str]]) ->
         )
     service.spreadsheets().batchUpdate(
         spreadsheetId=spreadsheet_id, body={"requests": requests_body}
-    ).execute()
+    ).execute(num_retries=API_RETRIES)
+
+
+def _row_spans(row_indices: Iterable[int]) -> List[Tuple[int, int]]:
+    """Merge row indices into (start, end) half-open runs of adjacent rows."""
+    spans: List[Tuple[int, int]] = []
+    for idx in sorted(set(row_indices)):
+        if spans and spans[-1][1] == idx:
+            spans[-1] = (spans[-1][0], idx + 1)
+        else:
+            spans.append((idx, idx + 1))
+    return spans
 
 
 __all__ = [
@@ -369,6 +625,7 @@ __all__ = [
     "push_rows",
     "push_pattern_sheets",
     "push_resources_sheet",
+    "formatting_requests",
     "get_credentials",
     "sanitize_title",
     "DEFAULT_HEADERS",
@@ -0,0 +1,141 @@
+"""Tests for aggregator.aggregator helpers that need no network access."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from aggregator import aggregator
+
+
+class LoadBaseSiteTests(unittest.TestCase):
+    def setUp(self) -> None:
+        aggregator._base_site_from_env_file.cache_clear()
+        self.addCleanup(aggregator._base_site_from_env_file.cache_clear)
+        env = mock.patch.dict(os.environ)
+        env.start()
+        self.addCleanup(env.stop)
+        os.environ.pop("BASE_SITE", None)
+
+    def _env_file(self, content: str) -> str:
+        fd, path = tempfile.mkstemp(suffix=".env")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_reads_value_from_env_file(self) -> None:
+        path = self._env_file('SHEET_ID=abc123\nBASE_SITE = "https://example.com/"\n')
+        self.assertEqual(aggregator.load_base_site(path), "https://example.com/")
+
+    def test_empty_value_falls_back_to_default(self) -> None:
+        path = self._env_file("BASE_SITE=\nSHEET_ID=abc123\n")
+        self.assertEqual(aggregator.load_base_site(path), aggregator.DEFAULT_BASE_SITE)
+
+
+@unittest.skipIf(aggregator.LexborHTMLParser is None, "selectolax is not installed")
+class HtmlExtractionParityTests(unittest.TestCase):
+    HTML = (
+        '<head><link rel="stylesheet" href="/a.css"></head>'
+        "<h2>Two  Pointers &amp; More</h2><ul>"
+        '<li><a href="/p">Two&nbsp;Sum</a> <b>Easy</b></li>'
+        "<li>Outer<ul><li>Inner</li></ul></li>"
+        "<li> 3Sum &lt;II&gt; </li></ul>"
+        "<h3>Empty</h3><h3>Trees</h3><ul><li>Path\n Sum</li></ul>"
+    )
+
+    def _regex_scan(self, html: str):
+        with mock.patch.object(aggregator, "LexborHTMLParser", None):
+            return aggregator.extract_patterns_from_html(html)
+
+    def test_tree_matches_regex_scan(self) -> None:
+        self.assertEqual(
+            aggregator._extract_patterns_from_html_tree(self.HTML),
+            self._regex_scan(self.HTML),
+        )
+
+    def test_link_tag_is_not_a_list_item(self) -> None:
+        html = "<link rel=x><h2>Two Pointers</h2><li>Two Sum</li>"
+        expected = [
+            {
+                "pattern": "Two Pointers",
+                "problems": [{"title": "Two Sum", "difficulty": "Unknown", "url": ""}],
+            }
+        ]
+        self.assertEqual(self._regex_scan(html), expected)
+        self.assertEqual(aggregator._extract_patterns_from_html_tree(html), expected)
+
+    def test_nested_items_are_not_duplicated(self) -> None:
+        blocks = aggregator._extract_patterns_from_html_tree(self.HTML)
+        titles = [p["title"] for p in blocks[0]["problems"]]
+        self.assertEqual(len(titles), 3)
+        self.assertNotIn("Inner", titles)
+
+
+class PartialCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        env = mock.patch.dict(os.environ, {aggregator.CACHE_DIR_ENV: cache_dir.name})
+        env.start()
+        self.addCleanup(env.stop)
+
+    def test_failed_additional_source_is_reported(self) -> None:
+        session = mock.Mock()
+        session.get.side_effect = OSError("offline")
+        patterns, complete = aggregator._fetch_additional_sources(session)
+        self.assertEqual(patterns, [])
+        self.assertFalse(complete)
+
+    def test_partial_results_expire_sooner(self) -> None:
+        key = ["k"]
+        patterns = [{"pattern": "Two Pointers", "problems": []}]
+        aggregator._write_cache(key, patterns, ttl=aggregator.PARTIAL_CACHE_TTL_SECONDS)
+        self.assertEqual(aggregator._read_cache(key), patterns)
+        mtime = os.path.getmtime(aggregator._cache_path())
+        later = mtime + aggregator.PARTIAL_CACHE_TTL_SECONDS + 1
+        with mock.patch.object(aggregator.time, "time", return_value=later):
+            self.assertIsNone(aggregator._read_cache(key))
+            aggregator._write_cache(key, patterns)
+            self.assertEqual(aggregator._read_cache(key), patterns)
+
+
+class NormalizeProblemsTests(unittest.TestCase):
+    def test_drops_duplicates_keeping_the_first(self) -> None:
+        problems = aggregator.normalize_problems(
+            [
+                {"title": "Two Sum", "difficulty": "Easy", "url": "a"},
+                {"title": "Two Sum", "difficulty": "Hard", "url": "a"},
+                {"title": "Two Sum", "difficulty": "Easy", "url": "b"},
+            ]
+        )
+        self.assertEqual(
+            problems,
+            [
+                {"title": "Two Sum", "difficulty": "Easy", "url": "a"},
+                {"title": "Two Sum", "difficulty": "Easy", "url": "b"},
+            ],
+        )
+
+    def test_generated_urls_count_for_dedupe(self) -> None:
+        problems = aggregator.normalize_problems([{"name": "3Sum"}, {"title": "3Sum"}])
+        self.assertEqual(
+            problems,
+            [
+                {
+                    "title": "3Sum",
+                    "difficulty": "Unknown",
+                    "url": "https://leetcode.com/problems/3sum/",
+                }
+            ],
+        )
+
+    def test_non_string_difficulty_is_kept(self) -> None:
+        problems = aggregator.normalize_problems([{"title": "A", "level": 1, "url": "a"}])
+        self.assertEqual(problems[0]["difficulty"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
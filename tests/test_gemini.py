@@ -0,0 +1,127 @@
+"""Tests for aggregator.gemini that fake the Gemini client; no network access."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from aggregator import gemini
+from aggregator.llm_cache import PromptCache
+
+
+def _summarizer(**kwargs) -> gemini.GeminiSummarizer:
+    summarizer = gemini.GeminiSummarizer(api_key="test-key", **kwargs)
+    summarizer._aensure_model = mock.AsyncMock()
+    return summarizer
+
+
+def _patterns(count: int):
+    return [{"pattern": f"P{i}", "url": f"u{i}", "problems": []} for i in range(count)]
+
+
+class ParseSummaryArrayTests(unittest.TestCase):
+    def test_reads_fenced_json_array(self) -> None:
+        text = '```json\n[{"pattern": "A", "summary": "one"}, {"summary": "two"}]\n```'
+        self.assertEqual(gemini._parse_summary_array(text, 2), ["one", "two"])
+
+    def test_plain_strings_are_accepted(self) -> None:
+        self.assertEqual(gemini._parse_summary_array('["one", "two"]', 2), ["one", "two"])
+
+    def test_rejects_wrong_length_and_malformed_replies(self) -> None:
+        self.assertIsNone(gemini._parse_summary_array('[{"summary": "one"}]', 2))
+        self.assertIsNone(gemini._parse_summary_array("not json", 1))
+        self.assertIsNone(gemini._parse_summary_array('{"summary": "one"}', 1))
+        self.assertIsNone(gemini._parse_summary_array(None, 1))
+
+
+class MarshaledSummaryTests(unittest.TestCase):
+    def setUp(self) -> None:
+        env = mock.patch.dict(os.environ, {gemini.MARSHAL_BATCH_ENV: "2"})
+        env.start()
+        self.addCleanup(env.stop)
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        self.cache = PromptCache(os.path.join(cache_dir.name, "cache.sqlite3"))
+        self.addCleanup(self.cache.close)
+        self.calls = []
+
+    def _fake_generate(self, json_reply: str):
+        async def generate(prompt, temperature, *, json_output=False):
+            self.calls.append(json_output)
+            if json_output:
+                return SimpleNamespace(text=json_reply)
+            return SimpleNamespace(text="single:" + prompt.splitlines()[1])
+
+        return generate
+
+    def test_one_request_per_group(self) -> None:
+        summarizer = _summarizer(cache=self.cache)
+        summarizer._agenerate = self._fake_generate('[{"summary": "a"}, {"summary": "b"}]')
+        records = asyncio.run(summarizer.summarize_patterns_async(_patterns(2)))
+        self.assertEqual([r["summary"] for r in records], ["a", "b"])
+        self.assertEqual(self.calls, [True])
+
+    def test_malformed_reply_falls_back_to_single_requests(self) -> None:
+        summarizer = _summarizer(cache=self.cache)
+        summarizer._agenerate = self._fake_generate("not json")
+        records = asyncio.run(summarizer.summarize_patterns_async(_patterns(2)))
+        self.assertEqual(
+            [r["summary"] for r in records], ["single:Pattern: P0", "single:Pattern: P1"]
+        )
+        self.assertEqual(self.calls, [True, False, False])
+
+    def test_marshaled_summaries_are_not_served_to_single_prompt_runs(self) -> None:
+        summarizer = _summarizer(cache=self.cache)
+        summarizer._agenerate = self._fake_generate('[{"summary": "a"}, {"summary": "b"}]')
+        asyncio.run(summarizer.summarize_patterns_async(_patterns(2)))
+
+        self.calls.clear()
+        asyncio.run(summarizer.summarize_patterns_async(_patterns(2)))
+        self.assertEqual(self.calls, [])  # a marshaling run reuses them
+
+        summarizer.marshal_batch = 1
+        records = asyncio.run(summarizer.summarize_patterns_async(_patterns(2)))
+        self.assertEqual(self.calls, [False, False])
+        self.assertEqual(records[0]["summary"], "single:Pattern: P0")
+
+
+class WaitForBatchTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.summarizer = gemini.GeminiSummarizer(api_key="test-key")
+        self.batches = mock.Mock()
+        self.summarizer.client = SimpleNamespace(batches=self.batches)
+        sleep = mock.patch.object(gemini.time, "sleep")
+        sleep.start()
+        self.addCleanup(sleep.stop)
+
+    def _states(self, *states: str) -> None:
+        self.batches.get.side_effect = [
+            SimpleNamespace(state=SimpleNamespace(name=state), error=None) for state in states
+        ]
+
+    def test_returns_the_succeeded_job(self) -> None:
+        self._states("JOB_STATE_PENDING", "JOB_STATE_RUNNING", "JOB_STATE_SUCCEEDED")
+        job = self.summarizer._wait_for_batch("batches/1", timeout=None)
+        self.assertEqual(job.state.name, "JOB_STATE_SUCCEEDED")
+        self.assertEqual(self.batches.get.call_count, 3)
+
+    def test_terminal_failures_raise_batch_unavailable(self) -> None:
+        for state in ("JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED"):
+            with self.subTest(state=state):
+                self._states("JOB_STATE_RUNNING", state)
+                with self.assertRaises(gemini.BatchUnavailable):
+                    self.summarizer._wait_for_batch("batches/1", timeout=None)
+
+    def test_timeout_cancels_the_job(self) -> None:
+        self._states("JOB_STATE_RUNNING")
+        with self.assertRaises(TimeoutError):
+            self.summarizer._wait_for_batch("batches/1", timeout=0)
+        self.batches.cancel.assert_called_once_with(name="batches/1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+"""Tests for aggregator.llm_cache."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from aggregator import llm_cache
+from aggregator.llm_cache import PromptCache
+
+
+class PromptCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        self.path = os.path.join(cache_dir.name, "cache.sqlite3")
+
+    def _cache(self, **kwargs) -> PromptCache:
+        cache = PromptCache(self.path, **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_set_many_stores_every_pair(self) -> None:
+        cache = self._cache()
+        cache.set_many("m", 0.2, [("p1", "r1"), ("p2", "r2")])
+        self.assertEqual(cache.get("m", 0.2, "p1"), "r1")
+        self.assertEqual(cache.get("m", 0.2, "p2"), "r2")
+        self.assertIsNone(cache.get("m", 0.3, "p1"))
+        self.assertIsNone(cache.get("other", 0.2, "p1"))
+
+    def test_set_many_replaces_existing_entries(self) -> None:
+        cache = self._cache()
+        cache.set_many("m", 0.2, [("p", "old")])
+        cache.set_many("m", 0.2, [("p", "new")])
+        self.assertEqual(cache.get("m", 0.2, "p"), "new")
+
+    def test_variants_are_kept_apart(self) -> None:
+        cache = self._cache()
+        cache.set_many("m", 0.2, [("p", "marshaled")], variant="marshaled")
+        self.assertIsNone(cache.get("m", 0.2, "p"))
+        self.assertEqual(cache.get("m", 0.2, "p", variant="marshaled"), "marshaled")
+
+    def test_entries_expire_after_ttl(self) -> None:
+        cache = self._cache(ttl_days=1)
+        cache.set_many("m", 0.2, [("p", "r")])
+        later = time.time() + 2 * 24 * 60 * 60
+        with mock.patch.object(llm_cache.time, "time", return_value=later):
+            self.assertIsNone(cache.get("m", 0.2, "p"))
+
+    def test_no_ttl_never_expires(self) -> None:
+        cache = self._cache(ttl_days=None)
+        cache.set_many("m", 0.2, [("p", "r")])
+        later = time.time() + 365 * 24 * 60 * 60
+        with mock.patch.object(llm_cache.time, "time", return_value=later):
+            self.assertEqual(cache.get("m", 0.2, "p"), "r")
+
+    def test_persists_across_instances(self) -> None:
+        self._cache().set_many("m", 0.2, [("p", "r")])
+        self.assertEqual(self._cache().get("m", 0.2, "p"), "r")
+
+
+if __name__ == "__main__":
+    unittest.main()
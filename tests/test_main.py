@@ -0,0 +1,51 @@
+"""Tests for the main.py upload pipeline with Sheets faked out."""
+
+from __future__ import annotations
+
+import asyncio
+import unittest
+from unittest import mock
+
+import main
+
+
+class UploadInOrderTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.pushed = []
+        push = mock.patch(
+            "sheet.sheet_populator.push_pattern_sheets",
+            side_effect=lambda sid, records, **kw: self.pushed.append(
+                [r["pattern"] for r in records]
+            ),
+        )
+        push.start()
+        self.addCleanup(push.stop)
+        chunk = mock.patch.object(main, "UPLOAD_CHUNK", 2)
+        chunk.start()
+        self.addCleanup(chunk.stop)
+
+    def _run(self, patterns, order) -> None:
+        async def go() -> None:
+            queue = asyncio.Queue()
+            for index in order:
+                queue.put_nowait((index, {"summary": f"S{index}"}))
+            queue.put_nowait(None)
+            await main._upload_in_order(queue, patterns, "sheet")
+
+        asyncio.run(go())
+
+    def test_pushes_contiguous_runs_in_pattern_order(self) -> None:
+        patterns = [{"pattern": f"P{i}"} for i in range(5)]
+        self._run(patterns, [1, 0, 3, 2, 4])
+        self.assertEqual(self.pushed, [["P0", "P1"], ["P2", "P3"], ["P4"]])
+        self.assertEqual([p["summary"] for p in patterns], ["S0", "S1", "S2", "S3", "S4"])
+
+    def test_missing_summary_is_an_error(self) -> None:
+        patterns = [{"pattern": f"P{i}"} for i in range(3)]
+        with self.assertRaises(RuntimeError):
+            self._run(patterns, [0, 2])
+        self.assertEqual(self.pushed, [["P0"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+"""Tests for sheet.sheet_populator request assembly with a fake Sheets service."""
+
+from __future__ import annotations
+
+import unittest
+from unittest import mock
+
+from sheet import sheet_populator
+
+
+class RowSpansTests(unittest.TestCase):
+    def test_merges_adjacent_rows(self) -> None:
+        self.assertEqual(
+            sheet_populator._row_spans([5, 1, 2, 3, 7, 7]), [(1, 4), (5, 6), (7, 8)]
+        )
+
+    def test_empty(self) -> None:
+        self.assertEqual(sheet_populator._row_spans([]), [])
+
+
+class NewSheetIdTests(unittest.TestCase):
+    def test_is_stable_and_non_negative(self) -> None:
+        sheet_id = sheet_populator._new_sheet_id("Two Pointers", [])
+        self.assertEqual(sheet_id, sheet_populator._new_sheet_id("Two Pointers", [0]))
+        self.assertGreaterEqual(sheet_id, 0)
+        self.assertLess(sheet_id, 2**31)
+
+    def test_skips_ids_in_use(self) -> None:
+        sheet_id = sheet_populator._new_sheet_id("Two Pointers", [])
+        self.assertEqual(
+            sheet_populator._new_sheet_id("Two Pointers", [sheet_id, sheet_id + 1]),
+            sheet_id + 2,
+        )
+
+
+class PushPatternSheetsTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.service = mock.MagicMock()
+        self.service.spreadsheets().get().execute.return_value = {
+            "sheets": [
+                {
+                    "properties": {
+                        "title": "Old",
+                        "sheetId": 5,
+                        "gridProperties": {"rowCount": 10, "columnCount": 26},
+                    }
+                }
+            ]
+        }
+        patcher = mock.patch.object(
+            sheet_populator, "_sheets_service", return_value=self.service
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _push(self, records, **kwargs):
+        sheet_populator.push_pattern_sheets("spreadsheet", records, **kwargs)
+        batch_update = self.service.spreadsheets().batchUpdate
+        self.assertEqual(batch_update.call_count, 1)  # every tab in one request
+        return batch_update.call_args.kwargs["body"]["requests"]
+
+    @staticmethod
+    def _record(name: str, count: int = 2):
+        problems = [
+            {"title": f"t{i}", "difficulty": "Easy", "url": f"u{i}"} for i in range(count)
+        ]
+        return {"pattern": name, "url": "u", "summary": "s", "problems": problems}
+
+    def test_adds_new_tabs_with_client_chosen_ids(self) -> None:
+        requests_body = self._push([self._record("New/Tab")])
+        new_id = sheet_populator._new_sheet_id("NewTab", [5])
+        add_sheet = requests_body[0]["addSheet"]["properties"]
+        self.assertEqual(add_sheet["title"], "NewTab")
+        self.assertEqual(add_sheet["sheetId"], new_id)
+        self.assertEqual(requests_body[1]["updateCells"]["start"]["sheetId"], new_id)
+
+    def test_existing_tab_is_cleared_then_rewritten(self) -> None:
+        requests_body = self._push([self._record("Old")])
+        self.assertEqual(
+            requests_body[0],
+            {"updateCells": {"range": {"sheetId": 5}, "fields": "userEnteredValue"}},
+        )
+        self.assertIn("start", requests_body[1]["updateCells"])
+
+    def test_small_grid_is_grown_before_writing(self) -> None:
+        requests_body = self._push([self._record("Old", count=20)])
+        kinds = [next(iter(r)) for r in requests_body]
+        self.assertLess(kinds.index("appendDimension"), kinds.index("updateCells", 1))
+        grow = requests_body[kinds.index("appendDimension")]["appendDimension"]
+        rows = requests_body[kinds.index("updateCells", 1)]["updateCells"]["rows"]
+        self.assertEqual(grow, {"sheetId": 5, "dimension": "ROWS", "length": len(rows) - 10})
+
+    def test_difficulty_rules_stay_on_one_sheet(self) -> None:
+        requests_body = self._push([self._record("Old"), self._record("New")])
+        rules = [
+            r["addConditionalFormatRule"]["rule"]
+            for r in requests_body
+            if "addConditionalFormatRule" in r
+        ]
+        self.assertEqual(len(rules), 6)
+        for rule in rules:
+            self.assertEqual(len({r["sheetId"] for r in rule["ranges"]}), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()